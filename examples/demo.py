@@ -2,7 +2,7 @@
 import sys
 
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QPixmap, QIcon
+from PyQt5.QtGui import QColor, QPixmap, QPalette
 from PyQt5.QtWidgets import QApplication, QLabel
 
 from qframelesswindow import FramelessWindow, StandardTitleBar
@@ -42,9 +42,11 @@ class Window(FramelessWindow):
         self.label.setScaledContents(True)
         self.label.setPixmap(QPixmap("screenshot/shoko.png"))
 
-        self.setWindowIcon(QIcon("screenshot/logo.png"))
+        self.setWindowIcon("screenshot/logo.png")
         self.setWindowTitle("PyQt-Frameless-Window")
-        self.setStyleSheet("background:white")
+        palette = self.palette()
+        palette.setColor(QPalette.Window, Qt.white)
+        self.setPalette(palette)
 
         self.titleBar.raise_()
 
@@ -20,7 +20,7 @@ class Window(FramelessWindow):
         # must replace QWebEngineView with FramelessWebEngineView
         self.webEngine = FramelessWebEngineView(self)
 
-        self.hBoxLayout.setContentsMargins(0, self.titleBar.height(), 0, 0)
+        self.hBoxLayout.setContentsMargins(0, 0, 0, 0)
         self.hBoxLayout.addWidget(self.webEngine)
 
         # load web page
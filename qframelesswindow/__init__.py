@@ -18,7 +18,9 @@ import sys
 
 from PyQt5.QtWidgets import QDialog, QMainWindow
 
-from .titlebar import TitleBar, TitleBarButton, SvgTitleBarButton, StandardTitleBar, TitleBarBase
+from .titlebar import (TitleBar, TitleBarButton, SvgTitleBarButton, StandardTitleBar, TitleBarBase,
+                       PaintedTitleBar, PaintedTitleBarButton, PaintedSvgTitleBarButton,
+                       TitleBarTheme, TitleBarButtonColors, LIGHT_THEME, DARK_THEME)
 
 if sys.platform == "win32":
     from .windows import AcrylicWindow
@@ -50,4 +52,15 @@ class FramelessMainWindow(QMainWindow, FramelessWindow):
     """ Frameless main window """
 
     def __init__(self, parent=None):
-        super().__init__(parent)
\ No newline at end of file
+        super().__init__(parent)
+
+    def setMenuWidget(self, widget):
+        super().setMenuWidget(widget)
+        self._updateContentsMargins()
+
+    def _titleBarMargin(self):
+        # the title bar used as menu widget is laid out by the main window
+        if self.menuWidget() is self.titleBar:
+            return 0
+
+        return super()._titleBarMargin()
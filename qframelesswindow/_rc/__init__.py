@@ -0,0 +1,6 @@
+# coding:utf-8
+
+
+def registerResources():
+    """ register the rcc resources of package, which are only loaded on first use """
+    from . import resource
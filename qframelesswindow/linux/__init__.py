@@ -1,14 +1,17 @@
 # coding:utf-8
-from PyQt5.QtCore import QCoreApplication, QEvent, Qt
-from PyQt5.QtGui import QMouseEvent
+from math import ceil
+from time import perf_counter
+
+from PyQt5.QtCore import QEvent, Qt, QTimer
+from PyQt5.QtGui import QPainter
 from PyQt5.QtWidgets import QWidget
 
-from ..titlebar import TitleBar
-from ..utils.linux_utils import LinuxMoveResize
+from ..titlebar import TitleBar, TitleBarWindowMixin
+from .hit_test import EdgeHitTestMap
 from .window_effect import LinuxWindowEffect
 
 
-class LinuxFramelessWindow(QWidget):
+class LinuxFramelessWindow(TitleBarWindowMixin, QWidget):
     """ Frameless window for Linux system """
 
     BORDER_WIDTH = 5
@@ -18,68 +21,291 @@ class LinuxFramelessWindow(QWidget):
         self.windowEffect = LinuxWindowEffect(self)
         self.titleBar = TitleBar(self)
         self._isResizeEnabled = True
+        self._windowHandle = None
+        self._windowX = 0
+        self._windowY = 0
+        self._hitTestMap = EdgeHitTestMap(self.BORDER_WIDTH)
+        self._resizeCursor = None
+        self._cursorChangeCount = 0
+        self._nativeResizeMargin = 0
+        self._isMarginTranslucent = False
+
+        # hover coalescing
+        self._hoverInterval = 0
+        self._lastHoverTime = 0
+        self._pendingHoverPos = None
+        self._hoverTimer = None
+        self._processedHoverCount = 0
+        self._coalescedHoverCount = 0
 
         self.updateFrameless()
-        QCoreApplication.instance().installEventFilter(self)
+
+        # xcffib is only imported when the first window is created, and the atoms are
+        # interned in advance, so the first move or resize doesn't wait for the X server
+        from ..utils.linux_utils import XcbConnection
+        if XcbConnection.isAvailable():
+            XcbConnection.instance()
+
+        # only watch the events of this window and its descendants
+        self._watchWidget(self)
 
         self.titleBar.raise_()
+        self._updateContentsMargins()
         self.resize(500, 500)
 
     def resizeEvent(self, e):
         super().resizeEvent(e)
-        self.titleBar.resize(self.width(), self.titleBar.height())
+        m = self._nativeResizeMargin
+        self.titleBar.setGeometry(m, m, self.width() - 2*m, self.titleBar.height())
+
+    def paintEvent(self, e):
+        if not self._isMarginTranslucent:
+            return super().paintEvent(e)
+
+        # the translucent window paints its own background, only the area inside the resize margin is visible
+        m = self._nativeResizeMargin
+        painter = QPainter(self)
+        painter.fillRect(self.rect().adjusted(m, m, -m, -m), self.palette().window())
 
     def updateFrameless(self):
         self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint)
 
-    def setTitleBar(self, titleBar):
-        """ set custom title bar
+    def setResizeEnabled(self, isEnabled: bool):
+        """ set whether resizing is enabled """
+        self._isResizeEnabled = isEnabled
+        if not isEnabled:
+            self._setResizeCursor(None)
+
+    def _updateContentsMargins(self):
+        m = self._nativeResizeMargin
+        self.setContentsMargins(m, m + self._titleBarMargin(), m, m)
+
+    def setResizeBorderWidths(self, left: int, top: int, right: int, bottom: int):
+        """ set the width of each resize border in device independent pixels """
+        self._hitTestMap.setBorderWidths(left, top, right, bottom)
+
+    def setResizeCornerSize(self, size: int):
+        """ set the length of the diagonal resize zones along each border """
+        self._hitTestMap.setCornerSize(size)
+
+    def setNativeResizeMargin(self, margin: int):
+        """ reserve an invisible resize margin around the window, which is hit-tested
+        by the window manager instead of the resize event filter
 
         Parameters
         ----------
-        titleBar: TitleBar
-            title bar
+        margin: int
+            width of the margin in device independent pixels, `0` disables the margin.
+            The margin must be enabled before the window is shown, because the
+            translucent visual of window is chosen when the native window is created
+
+        Returns
+        -------
+        isSupported: bool
+            whether the margin is used, the resize borders inside the window are
+            hit-tested as usual if the window manager does not support `_GTK_FRAME_EXTENTS`
+            or the native window of an opaque window already exists
         """
-        self.titleBar.deleteLater()
-        self.titleBar.hide()
-        self.titleBar = titleBar
-        self.titleBar.setParent(self)
-        self.titleBar.raise_()
+        from ..utils.linux_utils import LinuxFrameExtents
+        if margin > 0 and not LinuxFrameExtents.isSupported():
+            return False
 
-    def setResizeEnabled(self, isEnabled: bool):
-        """ set whether resizing is enabled """
-        self._isResizeEnabled = isEnabled
+        if margin == self._nativeResizeMargin:
+            return True
+
+        isCreated = self.testAttribute(Qt.WA_WState_Created)
+        if margin > 0 and not self.testAttribute(Qt.WA_TranslucentBackground):
+            if isCreated:
+                return False
+
+            self.setAttribute(Qt.WA_TranslucentBackground)
+            self._isMarginTranslucent = True
+        elif margin == 0 and self._isMarginTranslucent and not isCreated:
+            # the native window is not created yet, so the window can be opaque again
+            self.setAttribute(Qt.WA_TranslucentBackground, False)
+            self.setAttribute(Qt.WA_NoSystemBackground, False)
+            self._isMarginTranslucent = False
+
+        self._nativeResizeMargin = margin
+        if margin > 0:
+            self._setResizeCursor(None)
+
+        self._updateContentsMargins()
+        self.titleBar.setGeometry(margin, margin, self.width() - 2*margin, self.titleBar.height())
+
+        if isCreated:
+            LinuxFrameExtents.setFrameExtents(self, margin)
+
+        self.update()
+        return True
+
+    def setHoverEvaluationRate(self, rate: float):
+        """ set the maximum number of resize edge evaluations per second for hover moves
+
+        Parameters
+        ----------
+        rate: float
+            evaluation rate in Hz, usually the refresh rate of screen. Hover moves
+            arriving faster are coalesced into the latest one, `0` evaluates every move
+        """
+        self._hoverInterval = 1 / rate if rate > 0 else 0
+        if not self._hoverInterval and self._pendingHoverPos is not None:
+            self._hoverTimer.stop()
+            self._onHoverTimeout()
+
+    def processedHoverCount(self):
+        """ get the number of hover moves whose resize edges have been evaluated """
+        return self._processedHoverCount
+
+    def coalescedHoverCount(self):
+        """ get the number of hover moves coalesced into a later evaluation """
+        return self._coalescedHoverCount
+
+    def cursorChangeCount(self):
+        """ get the number of times the resize cursor has been changed """
+        return self._cursorChangeCount
+
+    def _setResizeCursor(self, cursor):
+        """ change the cursor only when the pointer enters another resize zone
+
+        Parameters
+        ----------
+        cursor: QCursor | None
+            shared resize cursor, `None` hands the cursor back to the child widgets
+        """
+        if cursor is self._resizeCursor:
+            return
+
+        self._resizeCursor = cursor
+        self._cursorChangeCount += 1
+        if cursor is None:
+            self.unsetCursor()
+        else:
+            self.setCursor(cursor)
+
+    def _watchWidget(self, widget):
+        """ install resize event filter on the widget and its descendants """
+        widget.installEventFilter(self)
+        for child in widget.children():
+            if child.isWidgetType() and not child.isWindow():
+                self._watchWidget(child)
+
+    def _unwatchWidget(self, widget):
+        """ remove resize event filter from the widget and its descendants """
+        widget.removeEventFilter(self)
+        for child in widget.children():
+            if child.isWidgetType() and not child.isWindow():
+                self._unwatchWidget(child)
+
+    def _watchWindowHandle(self):
+        """ install resize event filter on the native window, which receives all mouse moves """
+        handle = self.windowHandle()
+        if handle is not None and handle is not self._windowHandle:
+            self._windowHandle = handle
+            handle.installEventFilter(self)
+            handle.screenChanged.connect(self._updateFrameExtents)
+            self._updateFrameExtents()
+
+    def _updateFrameExtents(self):
+        if self._nativeResizeMargin and self.testAttribute(Qt.WA_WState_Created):
+            from ..utils.linux_utils import LinuxFrameExtents
+            LinuxFrameExtents.setFrameExtents(self, self._nativeResizeMargin)
+
+    def _updateResizeCursor(self, x, y):
+        """ update the resize cursor of a position relative to the window """
+        self._processedHoverCount += 1
+
+        # fast path: no Qt object is created while the pointer is in the interior
+        left, top, right, bottom = self._hitTestMap.innerRect()
+        if left <= x < right and top <= y < bottom:
+            if self._resizeCursor is not None:
+                self._setResizeCursor(None)
+
+            return
+
+        cursor = self._hitTestMap.hitTest(x, y)[1]
+        self._setResizeCursor(cursor if self.windowState() == Qt.WindowNoState else None)
+
+    def _coalesceHoverMove(self, x, y):
+        """ postpone the evaluation of a hover move to the next frame interval,
+        return `False` if the move should be evaluated right away """
+        now = perf_counter()
+        wait = self._lastHoverTime + self._hoverInterval - now
+        if wait <= 0:
+            self._lastHoverTime = now
+            if self._pendingHoverPos is not None:
+                self._hoverTimer.stop()
+                self._pendingHoverPos = None
+
+            return False
+
+        if self._hoverTimer is None:
+            self._hoverTimer = QTimer(self)
+            self._hoverTimer.setSingleShot(True)
+            self._hoverTimer.setTimerType(Qt.PreciseTimer)
+            self._hoverTimer.timeout.connect(self._onHoverTimeout)
+
+        self._pendingHoverPos = (x, y)
+        self._coalescedHoverCount += 1
+        if not self._hoverTimer.isActive():
+            self._hoverTimer.start(ceil(wait * 1000))
+
+        return True
+
+    def _onHoverTimeout(self):
+        pos = self._pendingHoverPos
+        self._pendingHoverPos = None
+        if pos is not None and self._isResizeEnabled:
+            self._lastHoverTime = perf_counter()
+            self._updateResizeCursor(*pos)
 
     def eventFilter(self, obj, event):
         et = event.type()
-        if et != QEvent.MouseButtonPress and et != QEvent.MouseMove or not self._isResizeEnabled:
+        if et == QEvent.MouseMove:
+            # the native window receives every move, the moves forwarded to widgets are duplicates
+            if obj is not self._windowHandle or not self._isResizeEnabled or self._nativeResizeMargin:
+                return False
+
+            x = event.globalX() - self._windowX
+            y = event.globalY() - self._windowY
+            if self._hoverInterval and not event.buttons() and self._coalesceHoverMove(x, y):
+                return False
+
+            self._updateResizeCursor(x, y)
+            return False
+        elif et == QEvent.MouseButtonPress:
+            if not self._isResizeEnabled or self._nativeResizeMargin:
+                return False
+
+            # presses are never coalesced, so resizing starts without delay
+            if self._pendingHoverPos is not None:
+                self._hoverTimer.stop()
+                self._pendingHoverPos = None
+
+            x = event.globalX() - self._windowX
+            y = event.globalY() - self._windowY
+            edges = self._hitTestMap.hitTest(x, y)[0]
+            if edges and (obj is self or obj is self.titleBar):
+                from ..utils.linux_utils import LinuxMoveResize
+                LinuxMoveResize.starSystemResize(self, event.globalPos(), edges)
+
             return False
+        elif et == QEvent.ChildAdded:
+            child = event.child()
+            if child.isWidgetType() and not child.isWindow():
+                self._watchWidget(child)
+        elif et == QEvent.ChildRemoved:
+            child = event.child()
+            if child.isWidgetType():
+                self._unwatchWidget(child)
+        elif obj is self:
+            if et == QEvent.Move:
+                self._windowX = self.x()
+                self._windowY = self.y()
+            elif et == QEvent.Resize:
+                self._hitTestMap.setSize(self.width(), self.height())
+                self._updateFrameExtents()
+            elif et == QEvent.Show:
+                self._watchWindowHandle()
 
-        edges = Qt.Edges()
-        pos = QMouseEvent(event).globalPos() - self.pos()
-        if pos.x() < self.BORDER_WIDTH:
-            edges |= Qt.LeftEdge
-        if pos.x() >= self.width()-self.BORDER_WIDTH:
-            edges |= Qt.RightEdge
-        if pos.y() < self.BORDER_WIDTH:
-            edges |= Qt.TopEdge
-        if pos.y() >= self.height()-self.BORDER_WIDTH:
-            edges |= Qt.BottomEdge
-
-        # change cursor
-        if et == QEvent.MouseMove and self.windowState() == Qt.WindowNoState:
-            if edges in (Qt.LeftEdge | Qt.TopEdge, Qt.RightEdge | Qt.BottomEdge):
-                self.setCursor(Qt.SizeFDiagCursor)
-            elif edges in (Qt.RightEdge | Qt.TopEdge, Qt.LeftEdge | Qt.BottomEdge):
-                self.setCursor(Qt.SizeBDiagCursor)
-            elif edges in (Qt.TopEdge, Qt.BottomEdge):
-                self.setCursor(Qt.SizeVerCursor)
-            elif edges in (Qt.LeftEdge, Qt.RightEdge):
-                self.setCursor(Qt.SizeHorCursor)
-            else:
-                self.setCursor(Qt.ArrowCursor)
-
-        elif obj in (self, self.titleBar) and et == QEvent.MouseButtonPress and edges:
-            LinuxMoveResize.starSystemResize(self, event.globalPos(), edges)
-
-        return super().eventFilter(obj, event)
+        return False
@@ -0,0 +1,148 @@
+# coding:utf-8
+from bisect import bisect_right
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QCursor
+
+
+def _buildCellTable():
+    """ build the (edges, cursor) table of the 5x5 hit-test grid
+
+    Along each axis, the cells are: outer border, corner zone, interior,
+    corner zone, opposite outer border. Cells with the same cursor share
+    one `QCursor` object, interior cells have no cursor.
+    """
+    fDiagCursor = QCursor(Qt.SizeFDiagCursor)
+    bDiagCursor = QCursor(Qt.SizeBDiagCursor)
+    verCursor = QCursor(Qt.SizeVerCursor)
+    horCursor = QCursor(Qt.SizeHorCursor)
+    cursors = {
+        int(Qt.LeftEdge | Qt.TopEdge): fDiagCursor,
+        int(Qt.RightEdge | Qt.BottomEdge): fDiagCursor,
+        int(Qt.RightEdge | Qt.TopEdge): bDiagCursor,
+        int(Qt.LeftEdge | Qt.BottomEdge): bDiagCursor,
+        int(Qt.TopEdge): verCursor,
+        int(Qt.BottomEdge): verCursor,
+        int(Qt.LeftEdge): horCursor,
+        int(Qt.RightEdge): horCursor,
+    }
+
+    table = []
+    for row in range(5):
+        for col in range(5):
+            edges = Qt.Edges()
+            onVertical = col == 0 or col == 4
+            onHorizontal = row == 0 or row == 4
+
+            # corner zones only count when the point is on an outer border
+            if onVertical or onHorizontal:
+                if col == 0 or onHorizontal and col == 1:
+                    edges |= Qt.LeftEdge
+                if col == 4 or onHorizontal and col == 3:
+                    edges |= Qt.RightEdge
+                if row == 0 or onVertical and row == 1:
+                    edges |= Qt.TopEdge
+                if row == 4 or onVertical and row == 3:
+                    edges |= Qt.BottomEdge
+
+            table.append((edges, cursors.get(int(edges))))
+
+    return tuple(table)
+
+
+class EdgeHitTestMap:
+    """ Precomputed hit-test regions of the window resize borders
+
+    The window is split into a 5x5 grid whose stops only change with the
+    window size or the border config, so a point query is two bisections
+    and a single table lookup.
+    """
+
+    _cells = None
+
+    def __init__(self, borderWidth=5, cornerSize=0):
+        """
+        Parameters
+        ----------
+        borderWidth: int
+            width of each resize border in device independent pixels
+
+        cornerSize: int
+            length of the corner zones along each border, a corner zone is
+            never smaller than the border width
+        """
+        if EdgeHitTestMap._cells is None:
+            EdgeHitTestMap._cells = _buildCellTable()
+
+        self._borders = (borderWidth,) * 4
+        self._cornerSize = cornerSize
+        self._width = 0
+        self._height = 0
+        self._xStops = (0, 0, 0, 0)
+        self._yStops = (0, 0, 0, 0)
+        self._innerRect = (0, 0, 0, 0)
+
+    def borderWidths(self):
+        """ get the border widths in (left, top, right, bottom) order """
+        return self._borders
+
+    def setBorderWidths(self, left, top, right, bottom):
+        """ set the width of each resize border in device independent pixels """
+        borders = (left, top, right, bottom)
+        if borders != self._borders:
+            self._borders = borders
+            self._rebuild()
+
+    def cornerSize(self):
+        """ get the size of corner zones """
+        return self._cornerSize
+
+    def setCornerSize(self, size):
+        """ set the size of corner zones in device independent pixels """
+        if size != self._cornerSize:
+            self._cornerSize = size
+            self._rebuild()
+
+    def setSize(self, width, height):
+        """ update the window size """
+        if width != self._width or height != self._height:
+            self._width = width
+            self._height = height
+            self._rebuild()
+
+    def innerRect(self):
+        """ get the (left, top, right, bottom) bounds of the area outside every resize zone """
+        return self._innerRect
+
+    def hitTest(self, x, y):
+        """ get the resize edges and cursor of a window position
+
+        Parameters
+        ----------
+        x, y: int
+            position relative to the top left corner of window
+
+        Returns
+        -------
+        edges: `Qt.Edges`
+            window edges, empty if the position is inside the window
+
+        cursor: QCursor | None
+            shared resize cursor of the position, `None` inside the window
+        """
+        return self._cells[bisect_right(self._yStops, y)*5 + bisect_right(self._xStops, x)]
+
+    def _rebuild(self):
+        left, top, right, bottom = self._borders
+        corner = self._cornerSize
+        self._xStops = self._stops(left, max(left, corner), max(right, corner), right, self._width)
+        self._yStops = self._stops(top, max(top, corner), max(bottom, corner), bottom, self._height)
+        self._innerRect = (self._xStops[0], self._yStops[0], self._xStops[3], self._yStops[3])
+
+    @staticmethod
+    def _stops(border, corner, oppositeCorner, oppositeBorder, length):
+        stops = [border, corner, length - oppositeCorner, length - oppositeBorder]
+        for i in range(1, 4):
+            stops[i] = max(stops[i], stops[i-1])
+
+        return tuple(stops)
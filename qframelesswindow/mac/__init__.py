@@ -4,11 +4,12 @@ import objc
 from PyQt5.QtCore import QEvent, Qt
 from PyQt5.QtWidgets import QWidget
 
-from ..titlebar import TitleBar
+from ..titlebar import TitleBar, TitleBarWindowMixin
+from ..utils.style_utils import FramelessStyle
 from .window_effect import MacWindowEffect
 
 
-class MacFramelessWindow(QWidget):
+class MacFramelessWindow(TitleBarWindowMixin, QWidget):
     """ Frameless window for Linux system """
 
     def __init__(self, parent=None):
@@ -23,6 +24,7 @@ class MacFramelessWindow(QWidget):
 
         self.updateFrameless()
 
+        self._updateContentsMargins()
         self.resize(500, 500)
         self.titleBar.raise_()
 
@@ -34,20 +36,6 @@ class MacFramelessWindow(QWidget):
         # hide system title bar
         self.__hideSystemTitleBar()
 
-    def setTitleBar(self, titleBar):
-        """ set custom title bar
-
-        Parameters
-        ----------
-        titleBar: TitleBar
-            title bar
-        """
-        self.titleBar.deleteLater()
-        self.titleBar.hide()
-        self.titleBar = titleBar
-        self.titleBar.setParent(self)
-        self.titleBar.raise_()
-
     def setResizeEnabled(self, isEnabled: bool):
         """ set whether resizing is enabled """
         self._isResizeEnabled = isEnabled
@@ -90,4 +78,4 @@ class AcrylicWindow(MacFramelessWindow):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.windowEffect.setAcrylicEffect(self.winId())
-        self.setStyleSheet("background: transparent")
+        FramelessStyle.setTransparentBackground(self)
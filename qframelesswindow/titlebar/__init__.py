@@ -1,23 +1,55 @@
 # coding:utf-8
 import sys
+import weakref
+from bisect import bisect_right
 
-from PyQt5.QtCore import QEvent, Qt
-from PyQt5.QtGui import QIcon
+from PyQt5 import sip
+from PyQt5.QtCore import QEvent, QPoint, QRect, QRectF, Qt
+from PyQt5.QtGui import QFontMetrics, QPainter, QPalette, QPixmap, QRegion, QStaticText, QTransform
 from PyQt5.QtWidgets import QHBoxLayout, QLabel, QWidget
 
 from ..utils import startSystemMove
-from .title_bar_buttons import (CloseButton, MaximizeButton, MinimizeButton,
-                                SvgTitleBarButton, TitleBarButton)
+from ..utils.style_utils import FramelessStyle
+from .title_bar_buttons import (CloseButton, MaximizeButton, MinimizeButton, PaintedCloseButton,
+                                PaintedMaximizeButton, PaintedMinimizeButton, PaintedSvgTitleBarButton,
+                                PaintedTitleBarButton, SvgTitleBarButton, TitleBarButton,
+                                TitleBarButtonState)
+from .icon_cache import IconCache
+from .pixmap_cache import PixmapCache
+from .theme import DARK_THEME, LIGHT_THEME, TitleBarButtonColors, TitleBarTheme
+from .title_label import TitleLabel
+from .window_mixin import TitleBarWindowMixin
 
 
 class TitleBarBase(QWidget):
     """ Title bar base class """
 
+    _defaultTheme = LIGHT_THEME
+    _titleBars = weakref.WeakSet()
+
+    # events of the watched widgets which move the non-drag region
+    _geometryEvents = (QEvent.Show, QEvent.Hide, QEvent.Move, QEvent.Resize, QEvent.ParentChange)
+
     def __init__(self, parent):
         super().__init__(parent)
-        self.minBtn = MinimizeButton(parent=self)
-        self.closeBtn = CloseButton(parent=self)
-        self.maxBtn = MaximizeButton(parent=self)
+        self._theme = LIGHT_THEME
+        TitleBarBase._titleBars.add(self)
+
+        # non-drag region index, which must exist before any button is added
+        self._interactiveWidgets = []
+        self._watchedWidgets = set()
+        self._pressedButtons = set()
+        self._nonDragLefts = []
+        self._nonDragRights = []
+        self._nonDragRects = []
+        self._isNonDragRegionDirty = True
+
+        # backing pixmap of the opaque title bar and its area to redraw
+        self._isOpaquePaintEnabled = False
+        self._backingPixmap = None
+        self._dirtyRegion = QRegion()
+
+        self._createButtons()
 
         self._isDoubleClickEnabled = True
 
@@ -31,14 +63,55 @@ class TitleBarBase(QWidget):
 
         self.window().installEventFilter(self)
 
+        if TitleBarBase._defaultTheme is not LIGHT_THEME:
+            TitleBarBase.setTheme(self, TitleBarBase._defaultTheme)
+
+    def _createButtons(self):
+        """ create the minimize, maximize and close buttons """
+        self.minBtn = MinimizeButton(parent=self)
+        self.closeBtn = CloseButton(parent=self)
+        self.maxBtn = MaximizeButton(parent=self)
+
     def eventFilter(self, obj, e):
         if obj is self.window():
             if e.type() == QEvent.WindowStateChange:
                 self.maxBtn.setMaxState(self.window().isMaximized())
                 return False
+        elif e.type() in self._geometryEvents and obj in self._watchedWidgets:
+            self._isNonDragRegionDirty = True
 
         return super().eventFilter(obj, e)
 
+    def childEvent(self, e):
+        super().childEvent(e)
+        if e.type() in (QEvent.ChildAdded, QEvent.ChildRemoved):
+            self._isNonDragRegionDirty = True
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if not self._isOpaquePaintEnabled:
+            return
+
+        # the backing pixmap is stale when the palette used to draw it changes
+        if e.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self._invalidate()
+        elif e.type() == QEvent.ActivationChange and not self.palette().isEqual(QPalette.Active, QPalette.Inactive):
+            self._invalidate()
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._updateWindowMargins()
+
+    def setVisible(self, isVisible: bool):
+        super().setVisible(isVisible)
+        self._updateWindowMargins()
+
+    def _updateWindowMargins(self):
+        """ keep the content of window below the title bar """
+        window = self.parentWidget()
+        if isinstance(window, TitleBarWindowMixin) and getattr(window, "titleBar", None) is self:
+            window._updateContentsMargins()
+
     def mouseDoubleClickEvent(self, event):
         """ Toggles the maximization state of the window """
         if event.button() != Qt.LeftButton or not self._isDoubleClickEnabled:
@@ -65,23 +138,142 @@ class TitleBarBase(QWidget):
         else:
             self.window().showMaximized()
 
+    def addInteractiveWidget(self, widget):
+        """ add an interactive widget, e.g. search box or tab bar, the area it covers
+        is not draggable. Title bar buttons are added automatically
+
+        Parameters
+        ----------
+        widget: QWidget
+            a descendant of title bar
+        """
+        if widget in self._interactiveWidgets:
+            return
+
+        self._interactiveWidgets.append(widget)
+        widget.destroyed.connect(self._onInteractiveWidgetDestroyed)
+        self._isNonDragRegionDirty = True
+
+    def removeInteractiveWidget(self, widget):
+        """ remove the interactive widget added by `addInteractiveWidget()` """
+        if widget not in self._interactiveWidgets:
+            return
+
+        self._interactiveWidgets.remove(widget)
+        widget.destroyed.disconnect(self._onInteractiveWidgetDestroyed)
+        self._isNonDragRegionDirty = True
+
+    def _onInteractiveWidgetDestroyed(self):
+        # the widget is removed from the index when it is rebuilt
+        self._isNonDragRegionDirty = True
+
+    def _onButtonStateChanged(self, state):
+        button = self.sender()
+        if state == TitleBarButtonState.PRESSED:
+            self._pressedButtons.add(button)
+        else:
+            self._pressedButtons.discard(button)
+
+    def _updateNonDragRegion(self):
+        """ rebuild the non-drag region index from the interactive widgets """
+        self._interactiveWidgets = [w for w in self._interactiveWidgets if not sip.isdeleted(w)]
+        widgets = self.findChildren(TitleBarButton)
+        widgets.extend(w for w in self._interactiveWidgets if w not in widgets)
+
+        # the widgets move with their containers, so the ancestors below title bar are watched too
+        watchedWidgets = set(widgets)
+        for widget in widgets:
+            parent = widget.parentWidget()
+            while parent is not None and parent is not self and parent not in watchedWidgets:
+                watchedWidgets.add(parent)
+                parent = parent.parentWidget()
+
+        # watch the geometry and pressed state of new widgets
+        for widget in watchedWidgets - self._watchedWidgets:
+            widget.installEventFilter(self)
+            if isinstance(widget, TitleBarButton):
+                widget.stateChanged.connect(self._onButtonStateChanged)
+                if widget.isPressed():
+                    self._pressedButtons.add(widget)
+
+        self._watchedWidgets = watchedWidgets
+        self._pressedButtons &= self._watchedWidgets
+
+        # merge the rectangles into disjoint horizontal intervals sorted by left edge
+        rects = sorted((QRect(w.mapTo(self, QPoint(0, 0)), w.size())
+                        for w in widgets if w.isVisibleTo(self)), key=QRect.left)
+        lefts, rights, groups = [], [], []
+        for rect in rects:
+            right = rect.left() + rect.width()
+            if rights and rect.left() < rights[-1]:
+                rights[-1] = max(rights[-1], right)
+                groups[-1].append(rect)
+            else:
+                lefts.append(rect.left())
+                rights.append(right)
+                groups.append([rect])
+
+        self._nonDragLefts = lefts
+        self._nonDragRights = rights
+        self._nonDragRects = groups
+        self._isNonDragRegionDirty = False
+
     def _isDragRegion(self, pos):
         """ Check whether the position belongs to the area where dragging is allowed """
-        width = 0
-        for button in self.findChildren(TitleBarButton):
-            if button.isVisible():
-                width += button.width()
+        if not 0 < pos.x() < self.width():
+            return False
+
+        if self._isNonDragRegionDirty:
+            self._updateNonDragRegion()
 
-        return 0 < pos.x() < self.width() - width
+        i = bisect_right(self._nonDragLefts, pos.x()) - 1
+        if i < 0 or pos.x() >= self._nonDragRights[i]:
+            return True
+
+        return not any(rect.contains(pos) for rect in self._nonDragRects[i])
 
     def _hasButtonPressed(self):
         """ whether any button is pressed """
-        return any(btn.isPressed() for btn in self.findChildren(TitleBarButton))
+        if self._isNonDragRegionDirty:
+            self._updateNonDragRegion()
+
+        return bool(self._pressedButtons)
 
     def canDrag(self, pos):
         """ whether the position is draggable """
         return self._isDragRegion(pos) and not self._hasButtonPressed()
 
+    def theme(self):
+        """ get the theme of title bar """
+        return self._theme
+
+    def setTheme(self, theme):
+        """ set the theme of title bar, only the buttons whose colors change are repainted
+
+        Parameters
+        ----------
+        theme: TitleBarTheme
+            theme, which can be shared by any number of title bars
+        """
+        self._theme = theme
+        self.minBtn.setColors(theme.buttonColors)
+        self.maxBtn.setColors(theme.buttonColors)
+        self.closeBtn.setColors(theme.closeButtonColors)
+
+    @classmethod
+    def setDefaultTheme(cls, theme):
+        """ set the theme of all the existing and future title bars in the process
+
+        Parameters
+        ----------
+        theme: TitleBarTheme
+            theme shared by all the title bars
+        """
+        TitleBarBase._defaultTheme = theme
+        for titleBar in list(TitleBarBase._titleBars):
+            if not sip.isdeleted(titleBar):
+                titleBar.setTheme(theme)
+
     def setDoubleClickEnabled(self, isEnabled):
         """ whether to switch window maximization status when double clicked
 
@@ -92,6 +284,75 @@ class TitleBarBase(QWidget):
         """
         self._isDoubleClickEnabled = isEnabled
 
+    def isOpaquePaintEnabled(self):
+        """ whether the title bar paints its own opaque background """
+        return self._isOpaquePaintEnabled
+
+    def setOpaquePaintEnabled(self, isEnabled):
+        """ whether the title bar paints its own opaque background from a cached pixmap.
+        The content below an opaque title bar is hidden, and repainting that content
+        no longer repaints the title bar
+
+        Parameters
+        ----------
+        isEnabled: bool
+            whether to enable opaque painting, the background color is the window
+            color of palette, which should not be translucent
+        """
+        if isEnabled == self._isOpaquePaintEnabled:
+            return
+
+        self._isOpaquePaintEnabled = isEnabled
+        self._backingPixmap = None
+        self.setAttribute(Qt.WA_OpaquePaintEvent, isEnabled)
+        self.update()
+
+    def _invalidate(self, rect=None):
+        """ repaint the area whose state changes, the backing pixmap of opaque title
+        bar is only redrawn in the invalidated area """
+        rect = self.rect() if rect is None else rect
+        if self._isOpaquePaintEnabled:
+            self._dirtyRegion = self._dirtyRegion.united(rect)
+
+        self.update(rect)
+
+    def _updateBackingPixmap(self):
+        ratio = self.devicePixelRatioF()
+        pixmap = self._backingPixmap
+        if pixmap is None or pixmap.size() != self.size() * ratio or pixmap.devicePixelRatioF() != ratio:
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            self._backingPixmap = pixmap
+            self._dirtyRegion = QRegion(self.rect())
+
+        if self._dirtyRegion.isEmpty():
+            return
+
+        painter = QPainter(pixmap)
+        painter.setClipRegion(self._dirtyRegion)
+        self._drawTitleBar(painter, self._dirtyRegion.boundingRect())
+        painter.end()
+        self._dirtyRegion = QRegion()
+
+    def _drawTitleBar(self, painter, rect):
+        """ draw the title bar in `rect`, the opaque title bar draws its background first """
+        if self._isOpaquePaintEnabled:
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(rect, self.palette().color(QPalette.Window))
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+    def paintEvent(self, e):
+        if not self._isOpaquePaintEnabled:
+            return
+
+        self._updateBackingPixmap()
+        painter = QPainter(self)
+        painter.drawPixmap(QRectF(e.rect()), self._backingPixmap, self._sourceRect(e.rect()))
+
+    def _sourceRect(self, rect):
+        """ map `rect` to the device pixels of backing pixmap """
+        r = self._backingPixmap.devicePixelRatioF()
+        return QRectF(rect.x()*r, rect.y()*r, rect.width()*r, rect.height()*r)
 
 
 class TitleBar(TitleBarBase):
@@ -122,18 +383,22 @@ class StandardTitleBar(TitleBar):
         self.hBoxLayout.insertSpacing(0, 10)
         self.hBoxLayout.insertWidget(1, self.iconLabel, 0, Qt.AlignLeft)
         self.window().windowIconChanged.connect(self.setIcon)
+        self._icon = None
+        self._iconKey = None
+        self._isScreenWatched = False
+        IconCache.instance().loaded.connect(self._onIconLoaded)
 
         # add title label
-        self.titleLabel = QLabel(self)
+        self.titleLabel = TitleLabel(self)
         self.hBoxLayout.insertWidget(2, self.titleLabel, 0, Qt.AlignLeft)
-        self.titleLabel.setStyleSheet("""
-            QLabel{
-                background: transparent;
-                font: 13px 'Segoe UI';
-                padding: 0 4px
-            }
-        """)
+
+        # the shared font replaces the style sheet, which can still be set to customize the label
+        font = FramelessStyle.titleFont()
+        self.titleLabel.setFont(font)
+        self.titleLabel.setContentsMargins(4, 0, 4, 0)
+        self.titleLabel.setIndent(QFontMetrics(font).horizontalAdvance("x") // 2)
         self.window().windowTitleChanged.connect(self.setTitle)
+        self._updateTitleColor()
 
     def setTitle(self, title):
         """ set the title of title bar
@@ -144,7 +409,103 @@ class StandardTitleBar(TitleBar):
             the title of title bar
         """
         self.titleLabel.setText(title)
-        self.titleLabel.adjustSize()
+
+    def setTheme(self, theme):
+        super().setTheme(theme)
+        self._updateTitleColor()
+
+    def _updateTitleColor(self):
+        color = self._theme.titleQColor(self.palette())
+        palette = self.titleLabel.palette()
+        if palette.color(QPalette.WindowText) != color:
+            palette.setColor(QPalette.WindowText, color)
+            self.titleLabel.setPalette(palette)
+
+    def setIcon(self, icon):
+        """ set the icon of title bar
+
+        Parameters
+        ----------
+        icon: QIcon | QPixmap | str
+            the icon of title bar, image file is decoded in background
+        """
+        self._icon = icon
+        self._iconKey, pixmap = IconCache.instance().pixmap(
+            icon, self.iconLabel.size(), self.devicePixelRatioF())
+
+        if pixmap is not None:
+            self.iconLabel.setPixmap(pixmap)
+
+    def _onIconLoaded(self, key):
+        pixmap = PixmapCache.instance().find(key) if key == self._iconKey else None
+        if pixmap is not None:
+            self.iconLabel.setPixmap(pixmap)
+
+    def _onScreenChanged(self):
+        # reload the icon for the device pixel ratio of new screen
+        if self._icon is not None:
+            self.setIcon(self._icon)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        if not self._isScreenWatched and self.window().windowHandle():
+            self.window().windowHandle().screenChanged.connect(self._onScreenChanged)
+            self._isScreenWatched = True
+
+
+class PaintedTitleBar(TitleBarBase):
+    """ Title bar with icon, title and buttons, which are all painted by the title
+    bar itself instead of child widgets """
+
+    def __init__(self, parent):
+        self._buttons = []
+        self._hoverButton = None
+        self._pressedButton = None
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setFont(FramelessStyle.titleFont())
+
+        # window icon
+        self._icon = None
+        self._iconKey = None
+        self._iconPixmap = None
+        self._iconRect = QRect(10, 6, 20, 20)
+        self._isScreenWatched = False
+        self.window().windowIconChanged.connect(self.setIcon)
+        IconCache.instance().loaded.connect(self._onIconLoaded)
+
+        # title, which is laid out like the title label of `StandardTitleBar`
+        self._title = ""
+        self._staticText = None
+        self._elidedWidth = -1
+        self.window().windowTitleChanged.connect(self.setTitle)
+
+        self._updateButtonGeometry()
+
+    def _createButtons(self):
+        self.minBtn = PaintedMinimizeButton(self)
+        self.closeBtn = PaintedCloseButton(self)
+        self.maxBtn = PaintedMaximizeButton(self)
+        self._buttons = [self.minBtn, self.maxBtn, self.closeBtn]
+
+    def title(self):
+        """ get the title of title bar """
+        return self._title
+
+    def setTitle(self, title):
+        """ set the title of title bar
+
+        Parameters
+        ----------
+        title: str
+            the title of title bar
+        """
+        if title == self._title:
+            return
+
+        self._title = title
+        self._staticText = None
+        self._invalidate(self._titleRect())
 
     def setIcon(self, icon):
         """ set the icon of title bar
@@ -152,6 +513,174 @@ class StandardTitleBar(TitleBar):
         Parameters
         ----------
         icon: QIcon | QPixmap | str
-            the icon of title bar
+            the icon of title bar, image file is decoded in background
         """
-        self.iconLabel.setPixmap(QIcon(icon).pixmap(20, 20))
+        self._icon = icon
+        self._iconKey, pixmap = IconCache.instance().pixmap(
+            icon, self._iconRect.size(), self.devicePixelRatioF())
+
+        if pixmap is not None:
+            self._setIconPixmap(pixmap)
+
+    def _setIconPixmap(self, pixmap):
+        self._iconPixmap = pixmap
+        self._invalidate(self._iconRect)
+
+    def _onIconLoaded(self, key):
+        pixmap = PixmapCache.instance().find(key) if key == self._iconKey else None
+        if pixmap is not None:
+            self._setIconPixmap(pixmap)
+
+    def _onScreenChanged(self):
+        # reload the icon for the device pixel ratio of new screen
+        if self._icon is not None:
+            self.setIcon(self._icon)
+
+    def setTheme(self, theme):
+        isTitleChanged = theme.titleColor != self._theme.titleColor
+        super().setTheme(theme)
+        if isTitleChanged:
+            self._invalidate(self._titleRect())
+
+    def buttonAt(self, pos):
+        """ get the visible button at `pos`, `None` if there is no button """
+        for button in self._buttons:
+            if not button.isHidden() and button._geometry.contains(pos):
+                return button
+
+        return None
+
+    def _updateButtonGeometry(self):
+        """ align the visible buttons to the right """
+        x = self.width()
+        for button in reversed(self._buttons):
+            if button.isHidden():
+                continue
+
+            x -= button.width()
+            button._geometry.moveTo(x, (self.height() - button.height()) // 2)
+
+        if self._hoverButton is not None and self._hoverButton.isHidden():
+            self._setHoverButton(None)
+
+        if self._pressedButton is not None and self._pressedButton.isHidden():
+            self._pressedButton.setState(TitleBarButtonState.NORMAL)
+            self._pressedButton = None
+
+        self._invalidate()
+
+    def _titleRect(self):
+        left = self._iconRect.right() + 1 + 4 + self.fontMetrics().horizontalAdvance("x") // 2
+        right = min((b._geometry.left() for b in self._buttons if not b.isHidden()), default=self.width())
+        return QRect(left, 0, max(right - 4 - left, 0), self.height())
+
+    def _setHoverButton(self, button):
+        if button is self._hoverButton:
+            return
+
+        if self._hoverButton is not None:
+            self._hoverButton.setState(TitleBarButtonState.NORMAL)
+
+        self._hoverButton = button
+        if button is not None:
+            button.setState(TitleBarButtonState.HOVER)
+
+    def _isDragRegion(self, pos):
+        return self.buttonAt(pos) is None and super()._isDragRegion(pos)
+
+    def _hasButtonPressed(self):
+        return self._pressedButton is not None or super()._hasButtonPressed()
+
+    def mouseMoveEvent(self, e):
+        # the pressed button keeps the mouse like a button widget
+        if self._pressedButton is None:
+            self._setHoverButton(self.buttonAt(e.pos()))
+
+        super().mouseMoveEvent(e)
+
+    def mousePressEvent(self, e):
+        button = self.buttonAt(e.pos())
+        if button is None:
+            super().mousePressEvent(e)
+        elif e.button() == Qt.LeftButton:
+            self._pressedButton = button
+            self._hoverButton = button
+            button.setState(TitleBarButtonState.PRESSED)
+
+    def mouseReleaseEvent(self, e):
+        button = self._pressedButton
+        if button is None or e.button() != Qt.LeftButton:
+            return super().mouseReleaseEvent(e)
+
+        self._pressedButton = None
+        if self.buttonAt(e.pos()) is not button:
+            self._setHoverButton(self.buttonAt(e.pos()))
+            return
+
+        # the click may close the window, so it is emitted last
+        button.setState(TitleBarButtonState.HOVER)
+        button.clicked.emit()
+
+    def mouseDoubleClickEvent(self, e):
+        # the second click on a button is another press
+        if self.buttonAt(e.pos()) is not None:
+            self.mousePressEvent(e)
+        else:
+            super().mouseDoubleClickEvent(e)
+
+    def leaveEvent(self, e):
+        super().leaveEvent(e)
+        if self._pressedButton is None:
+            self._setHoverButton(None)
+
+    def changeEvent(self, e):
+        if e.type() in (QEvent.FontChange, QEvent.PaletteChange):
+            self._staticText = None
+
+        super().changeEvent(e)
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._updateButtonGeometry()
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        if not self._isScreenWatched and self.window().windowHandle():
+            self.window().windowHandle().screenChanged.connect(self._onScreenChanged)
+            self._isScreenWatched = True
+
+    def paintEvent(self, e):
+        if self._isOpaquePaintEnabled:
+            super().paintEvent(e)
+        else:
+            self._drawTitleBar(QPainter(self), e.rect())
+
+    def _drawTitleBar(self, painter, rect):
+        super()._drawTitleBar(painter, rect)
+
+        # draw icon
+        pixmap = self._iconPixmap
+        if pixmap is not None and rect.intersects(self._iconRect):
+            ratio = pixmap.devicePixelRatioF()
+            y = self._iconRect.top() + (self._iconRect.height() - pixmap.height() / ratio) / 2
+            painter.drawPixmap(self._iconRect.left(), int(y), pixmap)
+
+        # draw title
+        titleRect = self._titleRect()
+        if self._title and rect.intersects(titleRect):
+            if self._staticText is None or self._elidedWidth != titleRect.width():
+                text = self.fontMetrics().elidedText(self._title, Qt.ElideRight, titleRect.width())
+                self._staticText = QStaticText(text)
+                self._staticText.setTextFormat(Qt.PlainText)
+                self._staticText.prepare(QTransform(), self.font())
+                self._elidedWidth = titleRect.width()
+
+            painter.setFont(self.font())
+            painter.setPen(self._theme.titleQColor(self.palette()))
+            y = (titleRect.height() - self._staticText.size().height()) / 2
+            painter.drawStaticText(titleRect.left(), int(y), self._staticText)
+
+        # draw buttons
+        for button in self._buttons:
+            if not button.isHidden() and rect.intersects(button._geometry):
+                button._paint(painter, button._geometry.x(), button._geometry.y())
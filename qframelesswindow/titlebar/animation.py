@@ -0,0 +1,144 @@
+# coding:utf-8
+from time import perf_counter
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, Qt, QTimer
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication
+
+
+class ColorTransition:
+    """ Color transition of a title bar button """
+
+    def __init__(self, button, colors, targets, duration):
+        """
+        Parameters
+        ----------
+        button: TitleBarButton
+            the animated button
+
+        colors: Tuple[QColor, QColor]
+            the current icon color and background color
+
+        targets: Tuple[QColor, QColor]
+            the final icon color and background color
+
+        duration: int
+            duration of transition in milliseconds
+        """
+        self.button = button
+        self.duration = duration / 1000
+        self.startTime = perf_counter()
+        self._starts = [c.getRgb() for c in colors]
+        self._deltas = [tuple(e - s for s, e in zip(c.getRgb(), t.getRgb()))
+                        for c, t in zip(colors, targets)]
+        self._rgba = None
+
+        # keep showing the current colors until the first frame
+        button._animatedColors = tuple(QColor(c) for c in colors)
+
+    def step(self, now):
+        """ interpolate the colors at `now`
+
+        Returns
+        -------
+        changed: bool
+            whether the interpolated colors differ from the last frame
+
+        finished: bool
+            whether the transition is finished
+        """
+        t = min((now - self.startTime) / self.duration, 1) if self.duration > 0 else 1
+        rgba = tuple(tuple(round(s + d*t) for s, d in zip(start, delta))
+                     for start, delta in zip(self._starts, self._deltas))
+
+        changed = rgba != self._rgba
+        self._rgba = rgba
+
+        # the finished button goes back to its cached pixmaps
+        if t >= 1:
+            self.button._animatedColors = None
+        elif changed:
+            self.button._animatedColors = tuple(QColor(*c) for c in rgba)
+
+        return changed, t >= 1
+
+
+class ColorAnimationEngine(QObject):
+    """ Animation engine which drives the color transitions of all the title bar
+    buttons with one timer, the timer only runs while a transition is active """
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self._transitions = {}
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._onFrame)
+        self.frameCount = 0
+
+    @classmethod
+    def instance(cls):
+        """ get the engine shared by the whole process """
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def animate(self, button, colors, targets, duration):
+        """ start a color transition of button, the running transition is replaced
+
+        Parameters
+        ----------
+        button: TitleBarButton
+            the animated button
+
+        colors: Tuple[QColor, QColor]
+            the current icon color and background color
+
+        targets: Tuple[QColor, QColor]
+            the final icon color and background color
+
+        duration: int
+            duration of transition in milliseconds
+        """
+        self._transitions[button] = ColorTransition(button, colors, targets, duration)
+
+        if not self.timer.isActive():
+            screen = QApplication.primaryScreen()
+            rate = screen.refreshRate() if screen else 60
+            self.timer.start(max(round(1000 / (rate or 60)), 1))
+
+    def stop(self, button):
+        """ stop the transition of button and show its final colors """
+        if self._transitions.pop(button, None) is not None:
+            button._animatedColors = None
+            button.update()
+
+    def isAnimating(self, button=None):
+        """ whether the button, or any button when `button` is `None`, is animating """
+        if button is None:
+            return bool(self._transitions)
+
+        return button in self._transitions
+
+    def _onFrame(self):
+        self.frameCount += 1
+        now = perf_counter()
+
+        for button, transition in list(self._transitions.items()):
+            if sip.isdeleted(button):
+                del self._transitions[button]
+                continue
+
+            changed, finished = transition.step(now)
+            if finished:
+                del self._transitions[button]
+
+            # only repaint the buttons whose color changed
+            if changed:
+                button.update()
+
+        if not self._transitions:
+            self.timer.stop()
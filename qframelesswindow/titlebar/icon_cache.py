@@ -0,0 +1,208 @@
+# coding:utf-8
+import weakref
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QImageReader, QPixmap
+from PyQt5.QtWidgets import QWidget
+
+from .pixmap_cache import PixmapCache
+
+
+class IconDecodeTask(QRunnable):
+    """ Task which decodes and scales an image file on the thread pool """
+
+    def __init__(self, cache, key, path, size):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.path = path
+        self.size = size
+
+    def run(self):
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+
+        # let the image plugin scale down while decoding when it can
+        size = reader.size()
+        if size.isValid() and (size.width() > self.size.width() or size.height() > self.size.height()):
+            reader.setScaledSize(size.scaled(self.size, Qt.KeepAspectRatio))
+
+        image = reader.read()
+        if not image.isNull() and (image.width() > self.size.width() or image.height() > self.size.height()):
+            image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # the cache is deleted with the interpreter if the process exits while decoding
+        if not sip.isdeleted(self.cache):
+            self.cache._decoded.emit(self.key, image)
+
+
+class IconCache(QObject):
+    """ Icon cache shared by all the title bars, which keys the icons by source and
+    device pixel ratio and decodes the image files on `QThreadPool`. A `QIcon` is
+    rasterized on the GUI thread unless it is created by `fileIcon()` """
+
+    # emitted with the key when an icon is ready
+    loaded = pyqtSignal(object)
+
+    # size of the native window icon, which is scaled down from the image file
+    WINDOW_ICON_SIZE = QSize(64, 64)
+
+    _decoded = pyqtSignal(object, QImage)
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self._pending = set()
+
+        # one icon per image file, the image files are also keyed by `QIcon.cacheKey()`
+        self._fileIcons = {}
+        self._windowIcons = {}
+        self._iconPaths = {}
+
+        # windows waiting for their icons to be decoded, with the key and image file of icon
+        self._pendingWindows = weakref.WeakKeyDictionary()
+        self._decoded.connect(self._onDecoded, Qt.QueuedConnection)
+
+    @classmethod
+    def instance(cls):
+        """ get the cache shared by the whole process """
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def fileIcon(self, path: str):
+        """ get the icon of an image file, which is keyed and decoded in
+        background like `path`, the same icon is returned for the same path
+
+        Parameters
+        ----------
+        path: str
+            path of image file
+
+        Returns
+        -------
+        icon: QIcon
+            the icon, e.g. for `TitleBar.setIcon()`. The window icon is set by
+            `setWindowIcon()`, Qt rasterizes the image file of this one when it is
+            handed to the window system
+        """
+        icon = self._fileIcons.get(path)
+        if icon is None:
+            icon = self._fileIcons[path] = QIcon(path)
+            self._iconPaths[icon.cacheKey()] = path
+
+        return icon
+
+    def setWindowIcon(self, window, icon):
+        """ set the icon of window, the image file is decoded and scaled down in
+        background, and the window keeps its icon until the decoded one is set
+
+        Parameters
+        ----------
+        window: QWidget
+            the window
+
+        icon: QIcon | str
+            the icon or the path of image file
+        """
+        self._pendingWindows.pop(window, None)
+        if not isinstance(icon, str):
+            return QWidget.setWindowIcon(window, icon)
+
+        key, pixmap = self.pixmap(icon, self.WINDOW_ICON_SIZE, window.devicePixelRatioF())
+        if pixmap is None:
+            self._pendingWindows[window] = (key, icon)
+        else:
+            QWidget.setWindowIcon(window, self._windowIcon(key, icon, pixmap))
+
+    def _windowIcon(self, key, path, pixmap):
+        """ get the icon of the decoded pixmap, which Qt hands to the window system as
+        it is, the title bars still find the image file of icon """
+        icon = self._windowIcons.get(key)
+        if icon is None:
+            icon = self._windowIcons[key] = QIcon(pixmap)
+            self._iconPaths[icon.cacheKey()] = path
+
+        return icon
+
+    def _source(self, icon):
+        """ get the image file of icon if it is known, otherwise the icon itself """
+        if isinstance(icon, QIcon):
+            return self._iconPaths.get(icon.cacheKey(), icon)
+
+        return icon
+
+    def key(self, icon, size: QSize, ratio: float):
+        """ get the cache key of icon """
+        icon = self._source(icon)
+        if isinstance(icon, str):
+            source = ("path", icon)
+        else:
+            source = (type(icon).__name__, icon.cacheKey())
+
+        return ("icon",) + source + (size.width(), size.height(), ratio)
+
+    def pixmap(self, icon, size: QSize, ratio: float):
+        """ get the pixmap of icon
+
+        Parameters
+        ----------
+        icon: QIcon | QPixmap | str
+            the icon, image file and the icon created by `fileIcon()` are decoded
+            in background, the others are rasterized immediately
+
+        size: QSize
+            icon size in device independent pixels
+
+        ratio: float
+            device pixel ratio
+
+        Returns
+        -------
+        key: tuple
+            the cache key of icon
+
+        pixmap: QPixmap | None
+            the cached pixmap, `None` if the image file is still being decoded and
+            `loaded` will be emitted with `key` when it is ready
+        """
+        icon = self._source(icon)
+        key = self.key(icon, size, ratio)
+        cache = PixmapCache.instance()
+        pixmap = cache.find(key)
+        if pixmap is not None:
+            return key, pixmap
+
+        if isinstance(icon, str):
+            if key not in self._pending:
+                self._pending.add(key)
+                QThreadPool.globalInstance().start(IconDecodeTask(self, key, icon, size * ratio))
+
+            return key, None
+
+        # the pixmap may be enlarged by the device pixel ratio of application
+        target = size * ratio
+        pixmap = QIcon(icon).pixmap(target)
+        if pixmap.width() > target.width() or pixmap.height() > target.height():
+            pixmap = pixmap.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        pixmap.setDevicePixelRatio(ratio)
+        cache.insert(key, pixmap)
+        return key, pixmap
+
+    def _onDecoded(self, key, image):
+        self._pending.discard(key)
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(key[-1])
+        PixmapCache.instance().insert(key, pixmap)
+
+        windows = [(w, path) for w, (k, path) in self._pendingWindows.items() if k == key]
+        for window, path in windows:
+            del self._pendingWindows[window]
+            if not sip.isdeleted(window):
+                QWidget.setWindowIcon(window, self._windowIcon(key, path, pixmap))
+
+        self.loaded.emit(key)
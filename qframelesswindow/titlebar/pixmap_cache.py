@@ -0,0 +1,113 @@
+# coding:utf-8
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QPixmap
+
+
+class PixmapCache:
+    """ Least-recently-used cache of rasterized title bar graphics shared by all windows """
+
+    _instance = None
+
+    def __init__(self, maxSize=4096):
+        """
+        Parameters
+        ----------
+        maxSize: int
+            the maximum total size of cached pixmaps in KB
+        """
+        self._pixmaps = OrderedDict()
+        self._maxSize = maxSize * 1024
+        self._size = 0
+        self.hitCount = 0
+        self.missCount = 0
+
+    @classmethod
+    def instance(cls):
+        """ get the cache shared by the whole process """
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def maxSize(self):
+        """ get the maximum total size of cached pixmaps in KB """
+        return self._maxSize // 1024
+
+    def setMaxSize(self, size):
+        """ set the maximum total size of cached pixmaps in KB """
+        self._maxSize = size * 1024
+        self._evict()
+
+    def size(self):
+        """ get the total size of cached pixmaps in KB """
+        return self._size // 1024
+
+    def clear(self):
+        """ remove all the cached pixmaps """
+        self._pixmaps.clear()
+        self._size = 0
+
+    def find(self, key):
+        """ get the cached pixmap of key, `None` if it is not cached """
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            self.missCount += 1
+            return None
+
+        self.hitCount += 1
+        self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def insert(self, key, pixmap):
+        """ cache the pixmap of key, the least recently used pixmaps are evicted
+        when the total size exceeds the limit """
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self._size -= self._cost(old)
+
+        self._pixmaps[key] = pixmap
+        self._size += self._cost(pixmap)
+        self._evict()
+
+    def pixmap(self, key, size, ratio, draw):
+        """ get the cached pixmap of key, or rasterize and cache it
+
+        Parameters
+        ----------
+        key: hashable
+            cache key, which must identify everything drawn by `draw`
+
+        size: QSize
+            pixmap size in device independent pixels
+
+        ratio: float
+            device pixel ratio of pixmap
+
+        draw: callable
+            function called with a `QPainter` on a transparent pixmap of logical `size`
+        """
+        pixmap = self.find(key)
+        if pixmap is not None:
+            return pixmap
+
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        draw(painter)
+        painter.end()
+
+        self.insert(key, pixmap)
+        return pixmap
+
+    def _evict(self):
+        while self._size > self._maxSize and self._pixmaps:
+            _, pixmap = self._pixmaps.popitem(last=False)
+            self._size -= self._cost(pixmap)
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
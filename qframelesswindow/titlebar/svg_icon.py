@@ -0,0 +1,79 @@
+# coding:utf-8
+from PyQt5.QtCore import QFile, QRectF
+from PyQt5.QtGui import QColor
+
+# QtSvg and QtXml are imported when the first icon is used
+
+
+class SvgIconTemplate:
+    """ Svg icon parsed once, whose `<path>` strokes are replaced by the icon color """
+
+    # placeholder written to the stroke attribute of every `<path>`
+    STROKE = b"__qframelesswindow_stroke__"
+
+    def __init__(self, iconPath):
+        """
+        Parameters
+        ----------
+        iconPath: str
+            the path of svg icon, resource path is supported
+        """
+        from PyQt5.QtXml import QDomDocument
+
+        self.path = iconPath
+
+        f = QFile(iconPath)
+        f.open(QFile.ReadOnly)
+        dom = QDomDocument()
+        dom.setContent(f.readAll())
+        f.close()
+
+        pathNodes = dom.elementsByTagName('path')
+        for i in range(pathNodes.length()):
+            pathNodes.at(i).toElement().setAttribute('stroke', self.STROKE.decode())
+
+        self._template = bytes(dom.toByteArray())
+
+    def data(self, color: QColor):
+        """ get the svg data of icon in `color` """
+        return self._template.replace(self.STROKE, color.name().encode())
+
+    def render(self, painter, rect: QRectF, color: QColor):
+        """ render the icon in `color` """
+        from PyQt5.QtSvg import QSvgRenderer
+        QSvgRenderer(self.data(color)).render(painter, rect)
+
+
+class SvgIconStore:
+    """ Reference-counted store of svg icon templates shared by all the buttons """
+
+    _templates = {}
+    _refCounts = {}
+
+    @classmethod
+    def acquire(cls, iconPath):
+        """ get the template of icon and increase its reference count, the file is
+        only parsed when the icon is not referenced by any button """
+        template = cls._templates.get(iconPath)
+        if template is None:
+            template = cls._templates[iconPath] = SvgIconTemplate(iconPath)
+            cls._refCounts[iconPath] = 0
+
+        cls._refCounts[iconPath] += 1
+        return template
+
+    @classmethod
+    def release(cls, iconPath):
+        """ decrease the reference count of icon, the template is removed when no
+        button references it """
+        count = cls._refCounts.get(iconPath, 0) - 1
+        if count > 0:
+            cls._refCounts[iconPath] = count
+        elif iconPath in cls._templates:
+            del cls._templates[iconPath]
+            del cls._refCounts[iconPath]
+
+    @classmethod
+    def refCount(cls, iconPath):
+        """ get the number of buttons referencing the icon """
+        return cls._refCounts.get(iconPath, 0)
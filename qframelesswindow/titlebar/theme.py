@@ -0,0 +1,90 @@
+# coding:utf-8
+from collections import namedtuple
+
+from PyQt5.QtGui import QColor, QPalette
+
+
+def toRgba(color):
+    """ convert a color to an immutable `QRgb` int, an int is taken as `QRgb` """
+    return color if type(color) is int else QColor(color).rgba()
+
+
+class TitleBarButtonColors(namedtuple("TitleBarButtonColors", [
+        "normalColor", "hoverColor", "pressedColor",
+        "normalBackgroundColor", "hoverBackgroundColor", "pressedBackgroundColor"])):
+    """ Immutable icon and background colors of a title bar button, shared by
+    all the buttons using them. The colors are stored as `QRgb` ints, use
+    `color()` to get a `QColor` """
+
+    __slots__ = ()
+
+    def __new__(cls, normalColor, hoverColor, pressedColor,
+                normalBackgroundColor, hoverBackgroundColor, pressedBackgroundColor):
+        colors = (normalColor, hoverColor, pressedColor,
+                  normalBackgroundColor, hoverBackgroundColor, pressedBackgroundColor)
+        return super().__new__(cls, *(toRgba(c) for c in colors))
+
+    def color(self, name):
+        """ get a new `QColor` of the color named `name`, e.g. `"hoverColor"` """
+        return QColor.fromRgba(getattr(self, name))
+
+    def replace(self, **colors):
+        """ get a copy whose colors are replaced by `colors`, `self` is returned
+        when no color changes """
+        changed = {}
+        for name, color in colors.items():
+            rgba = toRgba(color)
+            if getattr(self, name) != rgba:
+                changed[name] = rgba
+
+        return self._replace(**changed) if changed else self
+
+
+class TitleBarTheme(namedtuple("TitleBarTheme", ["buttonColors", "closeButtonColors", "titleColor"])):
+    """ Immutable title bar theme, which can be shared by any number of title bars
+
+    Parameters
+    ----------
+    buttonColors: TitleBarButtonColors
+        colors of the minimize and maximize buttons
+
+    closeButtonColors: TitleBarButtonColors
+        colors of the close button
+
+    titleColor: QColor | int | None
+        color of the title, `None` uses the palette of title bar. It is stored as
+        `QRgb` int, use `titleQColor()` to get a `QColor`
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, buttonColors, closeButtonColors, titleColor=None):
+        titleColor = None if titleColor is None else toRgba(titleColor)
+        return super().__new__(cls, buttonColors, closeButtonColors, titleColor)
+
+    def titleQColor(self, palette):
+        """ get a new `QColor` of the title, the window text color of `palette`
+        is used if the theme has no title color """
+        if self.titleColor is None:
+            return palette.color(QPalette.WindowText)
+
+        return QColor.fromRgba(self.titleColor)
+
+
+BUTTON_COLORS = TitleBarButtonColors(
+    QColor(0, 0, 0), QColor(0, 0, 0), QColor(0, 0, 0),
+    QColor(0, 0, 0, 0), QColor(0, 0, 0, 26), QColor(0, 0, 0, 51))
+
+CLOSE_BUTTON_COLORS = TitleBarButtonColors(
+    QColor(0, 0, 0), QColor(255, 255, 255), QColor(255, 255, 255),
+    QColor(0, 0, 0, 0), QColor(232, 17, 35), QColor(241, 112, 122))
+
+LIGHT_THEME = TitleBarTheme(BUTTON_COLORS, CLOSE_BUTTON_COLORS, None)
+
+DARK_THEME = TitleBarTheme(
+    TitleBarButtonColors(
+        QColor(255, 255, 255), QColor(255, 255, 255), QColor(255, 255, 255),
+        QColor(0, 0, 0, 0), QColor(255, 255, 255, 26), QColor(255, 255, 255, 51)),
+    CLOSE_BUTTON_COLORS.replace(normalColor=QColor(255, 255, 255)),
+    QColor(255, 255, 255)
+)
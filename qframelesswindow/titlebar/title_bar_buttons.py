@@ -1,13 +1,16 @@
 # coding:utf-8
 from enum import Enum
+from functools import partial
 
-from PyQt5.QtCore import QFile, QPointF, QRectF, Qt, pyqtProperty
+from PyQt5.QtCore import QObject, QPoint, QPointF, QRect, QRectF, QSize, Qt, pyqtProperty, pyqtSignal
 from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen
 from PyQt5.QtWidgets import QAbstractButton
-from PyQt5.QtSvg import QSvgRenderer
-from PyQt5.QtXml import QDomDocument
 
-from .._rc import resource
+from .._rc import registerResources
+from .animation import ColorAnimationEngine
+from .pixmap_cache import PixmapCache
+from .svg_icon import SvgIconStore
+from .theme import BUTTON_COLORS, CLOSE_BUTTON_COLORS
 
 
 class TitleBarButtonState(Enum):
@@ -17,24 +20,50 @@ class TitleBarButtonState(Enum):
     PRESSED = 2
 
 
-class TitleBarButton(QAbstractButton):
-    """ Title bar button """
-
-    def __init__(self, parent=None):
-        super().__init__(parent=parent)
-        self.setCursor(Qt.ArrowCursor)
-        self.setFixedSize(46, 32)
+def drawMinimizeIcon(painter, color):
+    """ draw the icon of minimize button """
+    painter.setBrush(Qt.NoBrush)
+    pen = QPen(color, 1)
+    pen.setCosmetic(True)
+    painter.setPen(pen)
+    painter.drawLine(18, 16, 28, 16)
+
+
+def drawMaximizeIcon(painter, color, isMax):
+    """ draw the icon of maximize button, `isMax` draws the restore icon """
+    painter.setBrush(Qt.NoBrush)
+    pen = QPen(color, 1)
+    pen.setCosmetic(True)
+    painter.setPen(pen)
+
+    r = painter.device().devicePixelRatioF()
+    painter.scale(1/r, 1/r)
+    if not isMax:
+        painter.drawRect(int(18*r), int(11*r), int(10*r), int(10*r))
+    else:
+        painter.drawRect(int(18*r), int(13*r), int(8*r), int(8*r))
+        x0 = int(18*r)+int(2*r)
+        y0 = 13*r
+        dw = int(2*r)
+        path = QPainterPath(QPointF(x0, y0))
+        path.lineTo(x0, y0-dw)
+        path.lineTo(x0+8*r, y0-dw)
+        path.lineTo(x0+8*r, y0-dw+8*r)
+        path.lineTo(x0+8*r-dw, y0-dw+8*r)
+        painter.drawPath(path)
+
+
+class TitleBarButtonMixin:
+    """ State and colors of title bar button, which are shared by the button widgets
+    and the buttons painted by `PaintedTitleBar` """
+
+    def _initButton(self):
         self._state = TitleBarButtonState.NORMAL
+        self._animationDuration = 0
+        self._animatedColors = None
 
-        # icon color
-        self._normalColor = QColor(0, 0, 0)
-        self._hoverColor = QColor(0, 0, 0)
-        self._pressedColor = QColor(0, 0, 0)
-
-        # background color
-        self._normalBgColor = QColor(0, 0, 0, 0)
-        self._hoverBgColor = QColor(0, 0, 0, 26)
-        self._pressedBgColor = QColor(0, 0, 0, 51)
+        # icon and background colors, which are shared with the other buttons
+        self._colors = BUTTON_COLORS
 
     def setState(self, state):
         """ set the state of button
@@ -44,36 +73,82 @@ class TitleBarButton(QAbstractButton):
         state: TitleBarButtonState
             the state of button
         """
-        self._state = state
+        if state != self._state:
+            colors = self._getColors()
+            self._state = state
+            self.stateChanged.emit(state)
+
+            if self._animationDuration > 0:
+                ColorAnimationEngine.instance().animate(
+                    self, colors, self._getStateColors(), self._animationDuration)
+                return
+            elif self._animatedColors is not None:
+                ColorAnimationEngine.instance().stop(self)
+
         self.update()
 
+    def animationDuration(self):
+        """ get the duration of color transition in milliseconds """
+        return self._animationDuration
+
+    def setAnimationDuration(self, duration):
+        """ set the duration of color transition when the state changes
+
+        Parameters
+        ----------
+        duration: int
+            duration in milliseconds, `0` switches colors instantly
+        """
+        self._animationDuration = duration
+
     def isPressed(self):
         """ whether the button is pressed """
         return self._state == TitleBarButtonState.PRESSED
 
+    def colors(self):
+        """ get the icon and background colors of button """
+        return self._colors
+
+    def setColors(self, colors):
+        """ set the icon and background colors of button, the button is only
+        repainted when the colors of its current state change
+
+        Parameters
+        ----------
+        colors: TitleBarButtonColors
+            colors, which can be shared by any number of buttons
+        """
+        if colors is self._colors:
+            return
+
+        oldColors = self._getStateRgba()
+        self._colors = colors
+        if self._getStateRgba() != oldColors:
+            self.update()
+
     def getNormalColor(self):
         """ get the icon color of the button in normal state """
-        return self._normalColor
+        return self._colors.color("normalColor")
 
     def getHoverColor(self):
         """ get the icon color of the button in hover state """
-        return self._hoverColor
+        return self._colors.color("hoverColor")
 
     def getPressedColor(self):
         """ get the icon color of the button in pressed state """
-        return self._pressedColor
+        return self._colors.color("pressedColor")
 
     def getNormalBackgroundColor(self):
         """ get the background color of the button in normal state """
-        return self._normalBgColor
+        return self._colors.color("normalBackgroundColor")
 
     def getHoverBackgroundColor(self):
         """ get the background color of the button in hover state """
-        return self._hoverBgColor
+        return self._colors.color("hoverBackgroundColor")
 
     def getPressedBackgroundColor(self):
         """ get the background color of the button in pressed state """
-        return self._pressedBgColor
+        return self._colors.color("pressedBackgroundColor")
 
     def setNormalColor(self, color):
         """ set the icon color of the button in normal state
@@ -83,8 +158,7 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             icon color
         """
-        self._normalColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(normalColor=color))
 
     def setHoverColor(self, color):
         """ set the icon color of the button in hover state
@@ -94,8 +168,7 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             icon color
         """
-        self._hoverColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(hoverColor=color))
 
     def setPressedColor(self, color):
         """ set the icon color of the button in pressed state
@@ -105,8 +178,7 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             icon color
         """
-        self._pressedColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(pressedColor=color))
 
     def setNormalBackgroundColor(self, color):
         """ set the background color of the button in normal state
@@ -116,8 +188,7 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             background color
         """
-        self._normalBgColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(normalBackgroundColor=color))
 
     def setHoverBackgroundColor(self, color):
         """ set the background color of the button in hover state
@@ -127,8 +198,7 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             background color
         """
-        self._hoverBgColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(hoverBackgroundColor=color))
 
     def setPressedBackgroundColor(self, color):
         """ set the background color of the button in pressed state
@@ -138,8 +208,77 @@ class TitleBarButton(QAbstractButton):
         color: QColor
             background color
         """
-        self._pressedBgColor = QColor(color)
-        self.update()
+        self.setColors(self._colors.replace(pressedBackgroundColor=color))
+
+    def _getColors(self):
+        """ get the icon color and background color """
+        return self._animatedColors or self._getStateColors()
+
+    def _getStateColors(self):
+        """ get the icon color and background color of current state """
+        color, bgColor = self._getStateRgba()
+        return QColor.fromRgba(color), QColor.fromRgba(bgColor)
+
+    def _getStateRgba(self):
+        """ get the `QRgb` of icon color and background color of current state """
+        colors = self._colors
+        if self._state == TitleBarButtonState.NORMAL:
+            return colors.normalColor, colors.normalBackgroundColor
+        elif self._state == TitleBarButtonState.HOVER:
+            return colors.hoverColor, colors.hoverBackgroundColor
+
+        return colors.pressedColor, colors.pressedBackgroundColor
+
+    def _iconKey(self):
+        """ get the key which identifies the icon drawn by `_drawIcon()` """
+        return type(self)
+
+    def _drawIcon(self, painter, color):
+        """ draw the icon of button on the pixmap cached by `paintEvent()` """
+        pass
+
+    def _paint(self, painter, x=0, y=0):
+        """ paint the button at `(x, y)` of painter """
+        color, bgColor = self._getColors()
+
+        # the frames of color transition are not worth caching
+        if self._animatedColors is not None:
+            painter.save()
+            painter.translate(x, y)
+            self._drawButton(painter, color, bgColor)
+            painter.restore()
+            return
+
+        ratio = self.devicePixelRatioF()
+
+        # the rasterized button of each state is shared by all the buttons
+        key = (self._iconKey(), color.rgba(), bgColor.rgba(), self.width(), self.height(), ratio)
+        pixmap = PixmapCache.instance().pixmap(
+            key, self.size(), ratio, lambda painter: self._drawButton(painter, color, bgColor))
+
+        painter.drawPixmap(x, y, pixmap)
+
+    def _drawButton(self, painter, color, bgColor):
+        """ draw the background and icon of button """
+        # draw background
+        painter.setBrush(bgColor)
+        painter.setPen(Qt.NoPen)
+        painter.drawRect(self.rect())
+
+        # draw icon
+        self._drawIcon(painter, color)
+
+
+class TitleBarButton(QAbstractButton, TitleBarButtonMixin):
+    """ Title bar button """
+
+    stateChanged = pyqtSignal(TitleBarButtonState)
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setCursor(Qt.ArrowCursor)
+        self.setFixedSize(46, 32)
+        self._initButton()
 
     def enterEvent(self, e):
         self.setState(TitleBarButtonState.HOVER)
@@ -156,24 +295,21 @@ class TitleBarButton(QAbstractButton):
         self.setState(TitleBarButtonState.PRESSED)
         super().mousePressEvent(e)
 
-    def _getColors(self):
-        """ get the icon color and background color """
-        if self._state == TitleBarButtonState.NORMAL:
-            return self._normalColor, self._normalBgColor
-        elif self._state == TitleBarButtonState.HOVER:
-            return self._hoverColor, self._hoverBgColor
-
-        return self._pressedColor, self._pressedBgColor
-
-    normalColor = pyqtProperty(QColor, getNormalColor, setNormalColor)
-    hoverColor = pyqtProperty(QColor, getHoverColor, setHoverColor)
-    pressedColor = pyqtProperty(QColor, getPressedColor, setPressedColor)
+    def paintEvent(self, e):
+        self._paint(QPainter(self))
+
+    normalColor = pyqtProperty(
+        QColor, TitleBarButtonMixin.getNormalColor, TitleBarButtonMixin.setNormalColor)
+    hoverColor = pyqtProperty(
+        QColor, TitleBarButtonMixin.getHoverColor, TitleBarButtonMixin.setHoverColor)
+    pressedColor = pyqtProperty(
+        QColor, TitleBarButtonMixin.getPressedColor, TitleBarButtonMixin.setPressedColor)
     normalBackgroundColor = pyqtProperty(
-        QColor, getNormalBackgroundColor, setNormalBackgroundColor)
+        QColor, TitleBarButtonMixin.getNormalBackgroundColor, TitleBarButtonMixin.setNormalBackgroundColor)
     hoverBackgroundColor = pyqtProperty(
-        QColor, getHoverBackgroundColor, setHoverBackgroundColor)
+        QColor, TitleBarButtonMixin.getHoverBackgroundColor, TitleBarButtonMixin.setHoverBackgroundColor)
     pressedBackgroundColor = pyqtProperty(
-        QColor, getPressedBackgroundColor, setPressedBackgroundColor)
+        QColor, TitleBarButtonMixin.getPressedBackgroundColor, TitleBarButtonMixin.setPressedBackgroundColor)
 
 
 class SvgTitleBarButton(TitleBarButton):
@@ -190,7 +326,8 @@ class SvgTitleBarButton(TitleBarButton):
             parent widget
         """
         super().__init__(parent)
-        self._svgDom = QDomDocument()
+        self._icon = None
+        self._releaseConnection = None
         self.setIcon(iconPath)
 
     def setIcon(self, iconPath):
@@ -201,50 +338,30 @@ class SvgTitleBarButton(TitleBarButton):
         iconPath: str
             the path of icon
         """
-        f = QFile(iconPath)
-        f.open(QFile.ReadOnly)
-        self._svgDom.setContent(f.readAll())
-        f.close()
+        icon = SvgIconStore.acquire(iconPath)
 
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
-        color, bgColor = self._getColors()
+        # the icon is released when the button is destroyed or its icon is replaced
+        if self._icon is not None:
+            self.destroyed.disconnect(self._releaseConnection)
+            SvgIconStore.release(self._icon.path)
 
-        # draw background
-        painter.setBrush(bgColor)
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(self.rect())
+        self._icon = icon
+        self._releaseConnection = self.destroyed.connect(partial(SvgIconStore.release, iconPath))
+        self.update()
 
-        # draw icon
-        color = color.name()
-        pathNodes = self._svgDom.elementsByTagName('path')
-        for i in range(pathNodes.length()):
-            element = pathNodes.at(i).toElement()
-            element.setAttribute('stroke', color)
+    def _iconKey(self):
+        return ("svg", self._icon.path)
 
-        renderer = QSvgRenderer(self._svgDom.toByteArray())
-        renderer.render(painter, QRectF(self.rect()))
+    def _drawIcon(self, painter, color):
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self._icon.render(painter, QRectF(self.rect()), color)
 
 
 class MinimizeButton(TitleBarButton):
     """ Minimize button """
 
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        color, bgColor = self._getColors()
-
-        # draw background
-        painter.setBrush(bgColor)
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(self.rect())
-
-        # draw icon
-        painter.setBrush(Qt.NoBrush)
-        pen = QPen(color, 1)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
-        painter.drawLine(18, 16, 28, 16)
+    def _drawIcon(self, painter, color):
+        drawMinimizeIcon(painter, color)
 
 
 class MaximizeButton(TitleBarButton):
@@ -262,44 +379,174 @@ class MaximizeButton(TitleBarButton):
         self._isMax = isMax
         self.setState(TitleBarButtonState.NORMAL)
 
-    def paintEvent(self, e):
-        painter = QPainter(self)
-        color, bgColor = self._getColors()
+    def _iconKey(self):
+        return (type(self), self._isMax)
 
-        # draw background
-        painter.setBrush(bgColor)
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(self.rect())
-
-        # draw icon
-        painter.setBrush(Qt.NoBrush)
-        pen = QPen(color, 1)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
-
-        r = self.devicePixelRatioF()
-        painter.scale(1/r, 1/r)
-        if not self._isMax:
-            painter.drawRect(int(18*r), int(11*r), int(10*r), int(10*r))
-        else:
-            painter.drawRect(int(18*r), int(13*r), int(8*r), int(8*r))
-            x0 = int(18*r)+int(2*r)
-            y0 = 13*r
-            dw = int(2*r)
-            path = QPainterPath(QPointF(x0, y0))
-            path.lineTo(x0, y0-dw)
-            path.lineTo(x0+8*r, y0-dw)
-            path.lineTo(x0+8*r, y0-dw+8*r)
-            path.lineTo(x0+8*r-dw, y0-dw+8*r)
-            painter.drawPath(path)
+    def _drawIcon(self, painter, color):
+        drawMaximizeIcon(painter, color, self._isMax)
 
 
 class CloseButton(SvgTitleBarButton):
     """ Close button """
 
     def __init__(self, parent=None):
+        registerResources()
+        super().__init__(":/qframelesswindow/close.svg", parent)
+        self.setColors(CLOSE_BUTTON_COLORS)
+
+
+class PaintedTitleBarButton(QObject, TitleBarButtonMixin):
+    """ Title bar button painted and hit-tested by `PaintedTitleBar`, which is not a widget """
+
+    clicked = pyqtSignal()
+    stateChanged = pyqtSignal(TitleBarButtonState)
+
+    def __init__(self, parent):
+        """
+        Parameters
+        ----------
+        parent: PaintedTitleBar
+            the title bar which paints the button
+        """
+        super().__init__(parent=parent)
+        self._initButton()
+        self._geometry = QRect(0, 0, 46, 32)
+        self._isHidden = False
+
+    def click(self):
+        """ emit the clicked signal """
+        self.clicked.emit()
+
+    def geometry(self):
+        """ get the geometry of button in the title bar """
+        return QRect(self._geometry)
+
+    def rect(self):
+        return QRect(QPoint(0, 0), self._geometry.size())
+
+    def size(self):
+        return self._geometry.size()
+
+    def width(self):
+        return self._geometry.width()
+
+    def height(self):
+        return self._geometry.height()
+
+    def setFixedSize(self, *size):
+        """ set the size of button, which accepts `QSize` or `(width, height)` """
+        self._geometry.setSize(QSize(*size))
+        self.parent()._updateButtonGeometry()
+
+    def devicePixelRatioF(self):
+        return self.parent().devicePixelRatioF()
+
+    def isVisible(self):
+        return not self._isHidden
+
+    def isHidden(self):
+        return self._isHidden
+
+    def setVisible(self, isVisible):
+        if self._isHidden != isVisible:
+            return
+
+        self._isHidden = not isVisible
+        self.parent()._updateButtonGeometry()
+
+    def setHidden(self, isHidden):
+        self.setVisible(not isHidden)
+
+    def show(self):
+        self.setVisible(True)
+
+    def hide(self):
+        self.setVisible(False)
+
+    def update(self):
+        """ schedule a repaint of the button area of title bar """
+        if not self._isHidden:
+            self.parent()._invalidate(self._geometry)
+
+
+class PaintedSvgTitleBarButton(PaintedTitleBarButton):
+    """ Painted title bar button using svg icon """
+
+    def __init__(self, iconPath, parent):
+        """
+        Parameters
+        ----------
+        iconPath: str
+            the path of icon
+
+        parent: PaintedTitleBar
+            the title bar which paints the button
+        """
+        super().__init__(parent)
+        self._icon = None
+        self._releaseConnection = None
+        self.setIcon(iconPath)
+
+    def setIcon(self, iconPath):
+        """ set the icon of button
+
+        Parameters
+        ----------
+        iconPath: str
+            the path of icon
+        """
+        icon = SvgIconStore.acquire(iconPath)
+
+        # the icon is released when the button is destroyed or its icon is replaced
+        if self._icon is not None:
+            self.destroyed.disconnect(self._releaseConnection)
+            SvgIconStore.release(self._icon.path)
+
+        self._icon = icon
+        self._releaseConnection = self.destroyed.connect(partial(SvgIconStore.release, iconPath))
+        self.update()
+
+    def _iconKey(self):
+        return ("svg", self._icon.path)
+
+    def _drawIcon(self, painter, color):
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self._icon.render(painter, QRectF(self.rect()), color)
+
+
+class PaintedMinimizeButton(PaintedTitleBarButton):
+    """ Painted minimize button """
+
+    def _drawIcon(self, painter, color):
+        drawMinimizeIcon(painter, color)
+
+
+class PaintedMaximizeButton(PaintedTitleBarButton):
+    """ Painted maximize button """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._isMax = False
+
+    def setMaxState(self, isMax):
+        """ update the maximized state and icon """
+        if self._isMax == isMax:
+            return
+
+        self._isMax = isMax
+        self.setState(TitleBarButtonState.NORMAL)
+
+    def _iconKey(self):
+        return (type(self), self._isMax)
+
+    def _drawIcon(self, painter, color):
+        drawMaximizeIcon(painter, color, self._isMax)
+
+
+class PaintedCloseButton(PaintedSvgTitleBarButton):
+    """ Painted close button """
+
+    def __init__(self, parent):
+        registerResources()
         super().__init__(":/qframelesswindow/close.svg", parent)
-        self.setHoverColor(Qt.white)
-        self.setPressedColor(Qt.white)
-        self.setHoverBackgroundColor(QColor(232, 17, 35))
-        self.setPressedBackgroundColor(QColor(241, 112, 122))
+        self.setColors(CLOSE_BUTTON_COLORS)
@@ -0,0 +1,172 @@
+# coding:utf-8
+from math import ceil
+
+from PyQt5.QtCore import QEvent, QSize, Qt, QTimer
+from PyQt5.QtGui import QFontMetricsF, QPainter, QStaticText, QTransform
+from PyQt5.QtWidgets import QApplication, QLabel, QStyle
+
+
+class TitleLabel(QLabel):
+    """ Title label, which paints a cached and elided layout of the title and
+    updates the geometry at most once per frame. The title is also set to
+    `QLabel`, so the alignment, text format and accessibility work as usual """
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self._text = ""
+        self._textWidth = 0
+        self._hintWidth = 0
+        self._staticText = None
+        self._staticTextFormat = None
+        self._elidedWidth = -1
+
+        # coalesce the title changes of one frame
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 60
+        self._textTimer = QTimer(self)
+        self._textTimer.setSingleShot(True)
+        self._textTimer.setInterval(max(round(1000 / (rate or 60)), 1))
+        self._textTimer.timeout.connect(self._applyText)
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        """ set the title, the layout is updated on the next frame """
+        if text == self._text:
+            return
+
+        self._text = text
+        self._staticText = None
+        if not self._textTimer.isActive():
+            self._textTimer.start()
+
+    def _applyText(self):
+        super().setText(self._text)
+        self._textWidth = self._measureText()
+
+        # the layout is only updated when the width of label changes
+        width = self._textRect().width()
+        if self._textWidth != self._hintWidth and not (
+                self._textWidth > width and self._hintWidth > width):
+            self._updateHint()
+
+        self.update()
+
+    def _updateHint(self):
+        self._hintWidth = self._textWidth
+        self.updateGeometry()
+
+    def _textFormat(self):
+        """ get the format of title, `Qt.AutoText` is resolved like `QLabel` """
+        textFormat = self.textFormat()
+        if textFormat == Qt.AutoText:
+            return Qt.RichText if Qt.mightBeRichText(self._text) else Qt.PlainText
+
+        return textFormat
+
+    def _createStaticText(self, text, textFormat):
+        staticText = QStaticText(text)
+        staticText.setTextFormat(textFormat)
+        staticText.prepare(QTransform(), self.font())
+        return staticText
+
+    def _measureText(self):
+        textFormat = self._textFormat()
+        if textFormat == Qt.PlainText:
+            return ceil(QFontMetricsF(self.font()).horizontalAdvance(self._text))
+
+        return ceil(self._createStaticText(self._text, textFormat).size().width())
+
+    def _alignment(self):
+        return QStyle.visualAlignment(self.layoutDirection(), self.alignment())
+
+    def _textIndent(self):
+        """ get the indent of text, which is computed the same way as `QLabel` """
+        if self.indent() >= 0:
+            return self.indent()
+
+        return self.fontMetrics().horizontalAdvance("x") // 2 if self.frameWidth() > 0 else 0
+
+    def _textRect(self):
+        """ get the rect of text, which is indented on the aligned sides like `QLabel` """
+        m = self.margin()
+        rect = self.contentsRect().adjusted(m, m, -m, -m)
+        indent = self._textIndent()
+        align = self._alignment()
+        if indent > 0:
+            if align & Qt.AlignLeft:
+                rect.setLeft(rect.left() + indent)
+            if align & Qt.AlignRight:
+                rect.setRight(rect.right() - indent)
+            if align & Qt.AlignTop:
+                rect.setTop(rect.top() + indent)
+            if align & Qt.AlignBottom:
+                rect.setBottom(rect.bottom() - indent)
+
+        return rect
+
+    def _hintSize(self, textWidth):
+        m = self.contentsMargins()
+        indent = self._textIndent()
+        align = self._alignment()
+        hIndent = indent if align & (Qt.AlignLeft | Qt.AlignRight) else 0
+        vIndent = indent if align & (Qt.AlignTop | Qt.AlignBottom) else 0
+        return QSize(textWidth + hIndent + 2*self.margin() + m.left() + m.right(),
+                     self.fontMetrics().height() + vIndent + 2*self.margin() + m.top() + m.bottom())
+
+    def sizeHint(self):
+        return self._hintSize(self._hintWidth)
+
+    def minimumSizeHint(self):
+        return self._hintSize(self.fontMetrics().horizontalAdvance("…"))
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._staticText = None
+            self._textWidth = self._measureText()
+            self._updateHint()
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+
+        # the width hint is stale if a title change skipped the layout update
+        if self._hintWidth != self._textWidth and e.size().width() != e.oldSize().width():
+            self._updateHint()
+
+    def paintEvent(self, e):
+        rect = self._textRect()
+        textFormat = self._textFormat()
+        if self._staticText is None or self._elidedWidth != rect.width() \
+                or self._staticTextFormat != textFormat:
+            # the markup of rich text can't be elided
+            text = self._text
+            if textFormat == Qt.PlainText:
+                text = self.fontMetrics().elidedText(text, Qt.ElideRight, rect.width())
+
+            self._staticText = self._createStaticText(text, textFormat)
+            self._staticTextFormat = textFormat
+            self._elidedWidth = rect.width()
+
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        painter.setPen(self.palette().color(self.foregroundRole()))
+
+        size = self._staticText.size()
+        align = self._alignment()
+        if align & Qt.AlignRight:
+            x = rect.left() + rect.width() - size.width()
+        elif align & Qt.AlignHCenter:
+            x = rect.left() + (rect.width() - size.width()) / 2
+        else:
+            x = rect.left()
+
+        if align & Qt.AlignTop:
+            y = rect.top()
+        elif align & Qt.AlignBottom:
+            y = rect.top() + rect.height() - size.height()
+        else:
+            y = rect.top() + (rect.height() - size.height()) / 2
+
+        painter.drawStaticText(int(x), int(y), self._staticText)
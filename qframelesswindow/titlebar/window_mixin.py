@@ -0,0 +1,69 @@
+# coding:utf-8
+from PyQt5.QtCore import Qt
+
+from .icon_cache import IconCache
+
+
+class TitleBarWindowMixin:
+    """ Title bar handling shared by the frameless windows of all platforms
+
+    The mixin must precede `QWidget` in the bases of window, so that its methods
+    override the ones of `QWidget`. The title bar keeps the top contents margin
+    of window in sync when it's resized, shown or hidden.
+    """
+
+    _isTitleBarOverlayEnabled = False
+
+    def setTitleBar(self, titleBar):
+        """ set custom title bar
+
+        Parameters
+        ----------
+        titleBar: TitleBar
+            title bar
+        """
+        self.titleBar.deleteLater()
+        self.titleBar.hide()
+        self.titleBar = titleBar
+        self.titleBar.setParent(self)
+        self.titleBar.raise_()
+        self._updateContentsMargins()
+
+    def setWindowIcon(self, icon):
+        """ set the icon of window
+
+        Parameters
+        ----------
+        icon: QIcon | str
+            window icon, the image file of path is decoded in background
+        """
+        IconCache.instance().setWindowIcon(self, icon)
+
+    def isTitleBarOverlayEnabled(self):
+        """ whether the title bar overlays the content of window """
+        return self._isTitleBarOverlayEnabled
+
+    def setTitleBarOverlayEnabled(self, isEnabled: bool):
+        """ set whether the title bar overlays the content of window
+
+        Parameters
+        ----------
+        isEnabled: bool
+            `False` keeps the content below the title bar with the top contents margin
+            of window, which follows the height of title bar. `True` extends the content
+            under the title bar for the overlay designs
+        """
+        self._isTitleBarOverlayEnabled = isEnabled
+        self._updateContentsMargins()
+
+    def _titleBarMargin(self):
+        """ get the top contents margin which keeps the content below the title bar """
+        titleBar = self.titleBar
+        isHidden = titleBar.isHidden() and titleBar.testAttribute(Qt.WA_WState_ExplicitShowHide)
+        if self._isTitleBarOverlayEnabled or isHidden:
+            return 0
+
+        return titleBar.height()
+
+    def _updateContentsMargins(self):
+        self.setContentsMargins(0, self._titleBarMargin(), 0, 0)
@@ -1,12 +1,30 @@
 # coding:utf-8
 import sys
 
-if sys.platform == "win32":
-    from .win32_utils import WindowsMoveResize as MoveResize
-elif sys.platform == "darwin":
-    from .mac_utils import MacMoveResize as MoveResize
-else:
-    from .linux_utils import LinuxMoveResize as MoveResize
+
+def _getMoveResize():
+    """ get the move resize class of platform, the platform utilities are only
+    imported on first use """
+    MoveResize = globals().get("MoveResize")
+    if MoveResize is not None:
+        return MoveResize
+
+    if sys.platform == "win32":
+        from .win32_utils import WindowsMoveResize as MoveResize
+    elif sys.platform == "darwin":
+        from .mac_utils import MacMoveResize as MoveResize
+    else:
+        from .linux_utils import LinuxMoveResize as MoveResize
+
+    globals()["MoveResize"] = MoveResize
+    return MoveResize
+
+
+def __getattr__(name):
+    if name == "MoveResize":
+        return _getMoveResize()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def startSystemMove(window, globalPos):
@@ -20,7 +38,7 @@ def startSystemMove(window, globalPos):
     globalPos: QPoint
         the global point of mouse release event
     """
-    MoveResize.startSystemMove(window, globalPos)
+    _getMoveResize().startSystemMove(window, globalPos)
 
 
 def starSystemResize(window, globalPos, edges):
@@ -37,4 +55,4 @@ def starSystemResize(window, globalPos, edges):
     edges: `Qt.Edges`
         window edges
     """
-    MoveResize.starSystemResize(window, globalPos, edges)
+    _getMoveResize().starSystemResize(window, globalPos, edges)
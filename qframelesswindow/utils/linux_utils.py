@@ -1,15 +1,24 @@
 # coding: utf-8
+import atexit
+import queue
+import struct
+import threading
+import warnings
+from concurrent.futures import Future
+from contextlib import contextmanager
 from enum import Enum
 
 import xcffib as xcb
+import xcffib.shape
 from PyQt5 import sip
-from PyQt5.QtCore import QPointF, Qt, QEvent, QPoint
+from PyQt5.QtCore import QObject, QPointF, Qt, QEvent, QPoint, QThread, pyqtSignal
 from PyQt5.QtGui import QMouseEvent
 from PyQt5.QtWidgets import QWidget, QApplication
 from PyQt5.QtX11Extras import QX11Info
-from xcffib.xproto import (ButtonIndex, ButtonMask, ButtonReleaseEvent,
-                           ClientMessageData, ClientMessageEvent, EventMask,
-                           xprotoExtension)
+from xcffib.xproto import (RECTANGLE, Atom, ButtonIndex, ButtonMask,
+                           ButtonReleaseEvent, ClientMessageData,
+                           ClientMessageEvent, ClipOrdering, EventMask,
+                           PropMode)
 
 
 class WindowMessage(Enum):
@@ -29,10 +38,544 @@ class WindowMessage(Enum):
     _NET_WM_MOVERESIZE_CANCEL = 11
 
 
+class XcbStats:
+    """ Opt-in counters of the X11 requests, flushes and blocking replies, grouped by
+    the operation (`move`, `resize`, `atom`, `effect` or `other`) that issued them """
+
+    isEnabled = False
+    warnGuiThreadReply = True
+
+    _counts = {}
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def setEnabled(cls, isEnabled: bool, warnGuiThreadReply=True):
+        """ set whether to count the X11 traffic
+
+        Parameters
+        ----------
+        isEnabled: bool
+            whether to count the X11 traffic
+
+        warnGuiThreadReply: bool
+            whether to warn when the GUI thread blocks on a reply from the X server
+        """
+        cls.isEnabled = isEnabled
+        cls.warnGuiThreadReply = warnGuiThreadReply
+
+    @classmethod
+    def snapshot(cls):
+        """ get a copy of the counters, e.g. `{"move": {"requests": 3, "flushes": 1,
+        "replies": 0, "guiThreadReplies": 0}}` """
+        with cls._lock:
+            return {operation: dict(counts) for operation, counts in cls._counts.items()}
+
+    @classmethod
+    def reset(cls):
+        """ reset all the counters """
+        with cls._lock:
+            cls._counts.clear()
+
+    @classmethod
+    @contextmanager
+    def operation(cls, name):
+        """ count the X11 traffic of current thread as the operation `name` """
+        previous = getattr(cls._local, "operation", None)
+        cls._local.operation = name
+        try:
+            yield
+        finally:
+            cls._local.operation = previous
+
+    @classmethod
+    def count(cls, key):
+        """ increase the counter of current operation """
+        if not cls.isEnabled:
+            return
+
+        operation = getattr(cls._local, "operation", None) or "other"
+        with cls._lock:
+            counts = cls._counts.get(operation)
+            if counts is None:
+                counts = cls._counts[operation] = dict.fromkeys(
+                    ("requests", "flushes", "replies", "guiThreadReplies"), 0)
+
+            counts[key] += 1
+
+    @classmethod
+    def instrument(cls, extension):
+        """ count the requests of an `xcffib.Extension` and the replies to them """
+        sendRequest = extension.send_request
+
+        def send_request(*args, **kwargs):
+            cookie = sendRequest(*args, **kwargs)
+            if cls.isEnabled:
+                cls.count("requests")
+                reply = cookie.reply
+                cookie.reply = lambda: cls._countReply(reply)
+
+            return cookie
+
+        extension.send_request = send_request
+        return extension
+
+    @classmethod
+    def _countReply(cls, reply):
+        cls.count("replies")
+
+        app = QApplication.instance()
+        if app is not None and QThread.currentThread() is app.thread():
+            cls.count("guiThreadReplies")
+            if cls.warnGuiThreadReply:
+                warnings.warn("The GUI thread is blocked by a reply from the X server", stacklevel=3)
+
+        return reply()
+
+
+class XcbAtomTable:
+    """ Atom table, which sends all the `InternAtom` requests in one batch
+    and only waits for a reply when an atom is used for the first time """
+
+    def __init__(self, xproto, names):
+        self.xproto = xproto
+        self._atoms = {}
+        with XcbStats.operation("atom"):
+            self._cookies = {name: self._intern(name) for name in names}
+
+    def _intern(self, name):
+        return self.xproto.InternAtom(False, len(name), name)
+
+    def __getitem__(self, name):
+        atom = self._atoms.get(name)
+        if atom is None:
+            with XcbStats.operation("atom"):
+                cookie = self._cookies.pop(name, None) or self._intern(name)
+                atom = self._atoms[name] = cookie.reply().atom
+
+        return atom
+
+    def resolve(self):
+        """ wait for all the atoms of the batch, whose replies arrive in one round trip """
+        for name in list(self._cookies):
+            self[name]
+
+
+class XcbBackend:
+    """ Backend which creates the XCB connections of the library, the GUI thread shares
+    the connection of Qt and the worker thread opens its own connection """
+
+    def isAvailable(self):
+        """ whether the X11 connection can be used """
+        return QX11Info.isPlatformX11()
+
+    def isCompositingManagerRunning(self):
+        """ whether a compositing manager is running """
+        return QX11Info.isCompositingManagerRunning()
+
+    def connect(self):
+        """ create the connection of GUI thread """
+        screen = QX11Info.appScreen()
+        conn = xcb.wrap(sip.unwrapinstance(QX11Info.connection()))
+        return XcbConnection(conn, screen, QX11Info.appRootWindow(screen))
+
+    def connectWorker(self, display=None):
+        """ create the connection of worker thread, raise `xcffib.ConnectionException` on failure """
+        conn = xcb.connect(display)
+        screen = conn.pref_screen
+        return XcbConnection(conn, screen, conn.get_setup().roots[screen].root)
+
+
+class XcbConnection:
+    """ XCB connection with the extensions, root window and atoms used by the library """
+
+    # atoms interned as soon as the connection is created
+    ATOMS = ("_NET_WM_MOVERESIZE", "_NET_SUPPORTED", "_GTK_FRAME_EXTENTS")
+
+    backend = XcbBackend()
+    _instance = None
+
+    def __init__(self, conn, screen, root):
+        """
+        Parameters
+        ----------
+        conn: xcffib.Connection
+            XCB connection
+
+        screen: int
+            screen number
+
+        root: int
+            root window of screen
+        """
+        self.conn = conn
+        self.xproto = XcbStats.instrument(conn.core)
+        self.shape = XcbStats.instrument(conn(xcffib.shape.key))
+        self.screen = screen
+        self.root = root
+        self.atoms = XcbAtomTable(self.xproto, self.ATOMS)
+
+        # asking for the atoms supported by the window manager needs the `_NET_SUPPORTED` atom,
+        # so the atom batch is answered here in one round trip. The supported atoms are asked
+        # for right after it and only waited for when they are used
+        self.atoms.resolve()
+        with XcbStats.operation("effect"):
+            self._supportedCookie = self.xproto.GetProperty(
+                False, root, self.atoms["_NET_SUPPORTED"], Atom.ATOM, 0, 4096)
+            self.flush()
+
+        self._supportedAtoms = None
+
+    def supportedAtoms(self):
+        """ get the atoms listed in the `_NET_SUPPORTED` property of root window """
+        if self._supportedAtoms is None:
+            with XcbStats.operation("effect"):
+                self._supportedAtoms = set(self._supportedCookie.reply().value.to_atoms())
+
+        return self._supportedAtoms
+
+    def flush(self):
+        """ flush the connection """
+        XcbStats.count("flushes")
+        self.conn.flush()
+
+    @classmethod
+    def instance(cls):
+        """ get the connection of Qt shared by all windows for the life of
+        application, only available on X11 """
+        if cls._instance is None:
+            cls._instance = cls.backend.connect()
+            QApplication.instance().destroyed.connect(cls._release)
+
+        return cls._instance
+
+    @classmethod
+    def isAvailable(cls):
+        """ whether the X11 connection can be used """
+        return cls.backend.isAvailable()
+
+    @classmethod
+    def setBackend(cls, backend):
+        """ replace the backend, the connections of the previous backend are no longer used
+
+        Parameters
+        ----------
+        backend: XcbBackend
+            the new backend, e.g. `xcb_testing.RecordingXcbBackend` to capture the traffic without X server
+        """
+        cls.backend = backend
+        cls._instance = None
+        LinuxFrameExtents._isSupported = None
+
+        if XcbWorker._instance is not None:
+            XcbWorker._instance.stop()
+
+    @classmethod
+    def _release(cls):
+        cls._instance = None
+
+
+class XcbRequest(QObject):
+    """ Request executed by `XcbWorker`, the signals are emitted in the thread
+    where the request is created """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    _done = pyqtSignal()
+
+    def __init__(self, func, pendingRequests=None):
+        """
+        Parameters
+        ----------
+        func: callable
+            function called with the `XcbConnection` of worker, its return value
+            is the result of request
+
+        pendingRequests: set
+            set which keeps the request alive until its signals are emitted
+        """
+        super().__init__()
+        self.func = func
+        self.future = Future()
+        self._pendingRequests = pendingRequests
+        if pendingRequests is not None:
+            pendingRequests.add(self)
+
+        self._done.connect(self._onDone, Qt.QueuedConnection)
+
+    def result(self, timeout=None):
+        """ wait for the result of request """
+        return self.future.result(timeout)
+
+    def _run(self, xcbConn):
+        try:
+            self.future.set_result(self.func(xcbConn))
+        except Exception as e:
+            self.future.set_exception(e)
+
+        self._done.emit()
+
+    def _fail(self, error):
+        self.future.set_exception(error)
+        self._done.emit()
+
+    def _onDone(self):
+        error = self.future.exception()
+        if error is None:
+            self.finished.emit(self.future.result())
+        else:
+            self.failed.emit(error)
+
+        if self._pendingRequests is not None:
+            self._pendingRequests.discard(self)
+
+
+class XcbWorker(QThread):
+    """ Worker thread with its own XCB connection, it runs the X11 requests that
+    are not latency critical so that the GUI thread never waits for the X server """
+
+    _instance = None
+
+    def __init__(self, display=None):
+        """
+        Parameters
+        ----------
+        display: str
+            X display to connect, `$DISPLAY` is used by default
+        """
+        super().__init__()
+        self.display = display
+        self._requests = queue.Queue()
+
+        # the requests dropped by callers stay alive until they report the result
+        self._pendingRequests = set()
+
+    @classmethod
+    def instance(cls):
+        """ get the worker shared by all windows, it is started on first use
+        and stopped when the application quits """
+        if cls._instance is None:
+            cls._instance = worker = cls()
+            QApplication.instance().aboutToQuit.connect(worker.stop)
+            atexit.register(worker.stop)
+            worker.start()
+
+        return cls._instance
+
+    def stop(self):
+        """ finish the pending requests and stop the worker """
+        if self.isRunning():
+            self._requests.put(None)
+            self.wait()
+
+        if XcbWorker._instance is self:
+            XcbWorker._instance = None
+
+        # the stopped worker may be deleted before the interpreter exits
+        atexit.unregister(self.stop)
+
+    def submit(self, func):
+        """ run a function on the worker thread
+
+        Parameters
+        ----------
+        func: callable
+            function called with the `XcbConnection` of worker
+
+        Returns
+        -------
+        request: XcbRequest
+            the request, whose signals report the result
+        """
+        request = XcbRequest(func, self._pendingRequests)
+        self._requests.put(request)
+        return request
+
+    def changeProperty(self, windowId, property, type, format, data, mode=PropMode.Replace):
+        """ change the property of window
+
+        Parameters
+        ----------
+        windowId: int
+            window id
+
+        property: str | int
+            property atom or its name
+
+        type: int
+            property type atom
+
+        format: int
+            format of property data, 8, 16 or 32
+
+        data: bytes
+            packed property data
+
+        mode: int
+            property mode
+        """
+        def func(xcbConn):
+            atom = self._atom(xcbConn, property)
+            xcbConn.xproto.ChangeProperty(
+                mode, windowId, atom, type, format, len(data) * 8 // format, data)
+
+        return self.submit(func)
+
+    def deleteProperty(self, windowId, property):
+        """ delete the property of window """
+        return self.submit(
+            lambda xcbConn: xcbConn.xproto.DeleteProperty(windowId, self._atom(xcbConn, property)))
+
+    def getProperty(self, windowId, property, type=Atom.Any, length=4096):
+        """ query the property of window, the result of request is the `GetPropertyReply` """
+        return self.submit(lambda xcbConn: xcbConn.xproto.GetProperty(
+            False, windowId, self._atom(xcbConn, property), type, 0, length).reply())
+
+    def sendClientMessage(self, windowId, messageType, data):
+        """ send a 32-bit client message about the window to the root window
+
+        Parameters
+        ----------
+        windowId: int
+            window id
+
+        messageType: str | int
+            message type atom or its name
+
+        data: List[int]
+            at most five message data
+        """
+        data = list(data) + [0] * (5 - len(data))
+
+        def func(xcbConn):
+            event = ClientMessageEvent.synthetic(
+                format=32,
+                window=windowId,
+                type=self._atom(xcbConn, messageType),
+                data=ClientMessageData.synthetic(data, "I"*5)
+            )
+            xcbConn.xproto.SendEvent(
+                False,
+                xcbConn.root,
+                EventMask.SubstructureRedirect | EventMask.SubstructureNotify,
+                event.pack()
+            )
+
+        return self.submit(func)
+
+    @staticmethod
+    def _atom(xcbConn, atom):
+        return xcbConn.atoms[atom] if isinstance(atom, str) else atom
+
+    def run(self):
+        try:
+            xcbConn = XcbConnection.backend.connectWorker(self.display)
+            conn = xcbConn.conn
+        except xcb.ConnectionException as e:
+            conn = None
+            error = e
+
+        isRunning = True
+        while isRunning:
+            # run all the queued requests before flushing the connection
+            requests = [self._requests.get()]
+            while not self._requests.empty():
+                requests.append(self._requests.get())
+
+            for request in requests:
+                if request is None:
+                    isRunning = False
+                elif conn is None:
+                    request._fail(error)
+                else:
+                    request._run(xcbConn)
+
+            if conn is not None:
+                xcbConn.flush()
+
+        if conn is not None:
+            conn.disconnect()
+
+
+# refer to: https://specifications.freedesktop.org/wm-spec/1.1/x170.html
+EDGE_MESSAGES = {
+    int(Qt.TopEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_TOP.value,
+    int(Qt.TopEdge | Qt.LeftEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_TOPLEFT.value,
+    int(Qt.TopEdge | Qt.RightEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_TOPRIGHT.value,
+    int(Qt.BottomEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOM.value,
+    int(Qt.BottomEdge | Qt.LeftEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOMLEFT.value,
+    int(Qt.BottomEdge | Qt.RightEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOMRIGHT.value,
+    int(Qt.LeftEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_LEFT.value,
+    int(Qt.RightEdge): WindowMessage._NET_WM_MOVERESIZE_SIZE_RIGHT.value,
+}
+
+
+class XcbEventTemplate:
+    """ Pre-packed event, only the fields that change between requests are patched in """
+
+    def __init__(self, event, offset, fields):
+        """
+        Parameters
+        ----------
+        event: xcffib.Event
+            the event whose packed bytes are used as template
+
+        offset: int
+            byte offset of the first patched field
+
+        fields: str
+            struct format of the patched fields
+        """
+        self._buffer = bytearray(event.pack())
+        self._offset = offset
+        self._fields = struct.Struct(fields)
+
+    def pack(self, *values):
+        """ get the packed event with the fields replaced by `values` """
+        self._fields.pack_into(self._buffer, self._offset, *values)
+        return bytes(self._buffer)
+
+
+# refer to: https://www.x.org/releases/X11R7.5/doc/libxcb/tutorial/
+# patched fields: root, event, child, root_x, root_y, event_x, event_y
+BUTTON_RELEASE_TEMPLATE = XcbEventTemplate(ButtonReleaseEvent.synthetic(
+    detail=ButtonIndex._1,
+    time=xcb.CurrentTime,
+    root=0,
+    event=0,
+    child=xcb.NONE,
+    root_x=0,
+    root_y=0,
+    event_x=0,
+    event_y=0,
+    state=ButtonMask._1,
+    same_screen=True,
+), 8, "=IIIhhhh")
+
+# patched fields: window, message type, x_root, y_root, direction
+MOVE_RESIZE_TEMPLATE = XcbEventTemplate(ClientMessageEvent.synthetic(
+    format=32,
+    window=0,
+    type=0,
+    data=ClientMessageData.synthetic([0, 0, 0, ButtonIndex._1, 0], "I"*5)
+), 4, "=IIiiI")
+
+
 class LinuxMoveResize:
     """ Tool class for moving and resizing window """
 
-    moveResizeAtom = None
+    @staticmethod
+    def _nativePos(window, globalPos):
+        """ convert the global position to device pixels """
+        return QPointF(QPointF(globalPos) * window.devicePixelRatio()).toPoint()
+
+    @staticmethod
+    def _queueButtonReleaseEvent(xcbConn, window, windowId, nativePos):
+        """ queue the button release event without flushing the connection """
+        pos = window.mapFromGlobal(nativePos)
+        event = BUTTON_RELEASE_TEMPLATE.pack(
+            xcbConn.root, windowId, xcb.NONE, nativePos.x(), nativePos.y(), pos.x(), pos.y())
+        xcbConn.xproto.SendEvent(True, windowId, EventMask.ButtonRelease, event)
 
     @classmethod
     def sendButtonReleaseEvent(cls, window, globalPos):
@@ -46,31 +589,10 @@ class LinuxMoveResize:
         globalPos: QPoint
             the global point of mouse release event
         """
-        globalPos = QPointF(QPointF(globalPos) *
-                            window.devicePixelRatio()).toPoint()
-        pos = window.mapFromGlobal(globalPos)
-
-        # open the connection to X server
-        conn = xcb.wrap(sip.unwrapinstance(QX11Info.connection()))
-        windowId = int(window.winId())
-        xproto = xprotoExtension(conn)
-
-        # refer to: https://www.x.org/releases/X11R7.5/doc/libxcb/tutorial/
-        event = ButtonReleaseEvent.synthetic(
-            detail=ButtonIndex._1,
-            time=xcb.CurrentTime,
-            root=QX11Info.appRootWindow(QX11Info.appScreen()),
-            event=windowId,
-            child=xcb.NONE,
-            root_x=globalPos.x(),
-            root_y=globalPos.y(),
-            event_x=pos.x(),
-            event_y=pos.y(),
-            state=ButtonMask._1,
-            same_screen=True,
-        )
-        xproto.SendEvent(True, windowId, EventMask.ButtonRelease, event.pack())
-        conn.flush()
+        xcbConn = XcbConnection.instance()
+        cls._queueButtonReleaseEvent(
+            xcbConn, window, int(window.winId()), cls._nativePos(window, globalPos))
+        xcbConn.flush()
 
     @classmethod
     def startSystemMoveResize(cls, window, globalPos, message):
@@ -87,45 +609,31 @@ class LinuxMoveResize:
         message: int
             window message
         """
-        cls.sendButtonReleaseEvent(window, globalPos)
+        isMove = message == WindowMessage._NET_WM_MOVERESIZE_MOVE.value
+        with XcbStats.operation("move" if isMove else "resize"):
+            xcbConn = XcbConnection.instance()
+            xproto = xcbConn.xproto
+            windowId = int(window.winId())
+            nativePos = cls._nativePos(window, globalPos)
 
-        globalPos = QPointF(QPointF(globalPos) *
-                            window.devicePixelRatio()).toPoint()
+            # release the button, ungrab the pointer and hand over to window manager in one flush
+            cls._queueButtonReleaseEvent(xcbConn, window, windowId, nativePos)
+            xproto.UngrabPointer(xcb.CurrentTime)
 
-        # open the connection to X server
-        conn = xcb.wrap(sip.unwrapinstance(QX11Info.connection()))
-        xproto = xprotoExtension(conn)
-
-        if not cls.moveResizeAtom:
-            cls.moveResizeAtom = xproto.InternAtom(
-                False, len("_NET_WM_MOVERESIZE"), "_NET_WM_MOVERESIZE").reply().atom
-
-        union = ClientMessageData.synthetic([
-            globalPos.x(),
-            globalPos.y(),
-            message,
-            ButtonIndex._1,
-            0
-        ], "I"*5)
-        event = ClientMessageEvent.synthetic(
-            format=32,
-            window=int(window.winId()),
-            type=cls.moveResizeAtom,
-            data=union
-        )
-        xproto.UngrabPointer(xcb.CurrentTime)
-        xproto.SendEvent(
-            False,
-            QX11Info.appRootWindow(QX11Info.appScreen()),
-            EventMask.SubstructureRedirect | EventMask.SubstructureNotify,
-            event.pack()
-        )
-        conn.flush()
+            event = MOVE_RESIZE_TEMPLATE.pack(
+                windowId, xcbConn.atoms["_NET_WM_MOVERESIZE"], nativePos.x(), nativePos.y(), message)
+            xproto.SendEvent(
+                False,
+                xcbConn.root,
+                EventMask.SubstructureRedirect | EventMask.SubstructureNotify,
+                event
+            )
+            xcbConn.flush()
 
     @classmethod
     def startSystemMove(cls, window, globalPos):
         """ move window """
-        if QX11Info.isPlatformX11():
+        if XcbConnection.isAvailable():
             cls.startSystemMoveResize(
                 window, globalPos, WindowMessage._NET_WM_MOVERESIZE_MOVE.value)
         else:
@@ -152,17 +660,79 @@ class LinuxMoveResize:
         if not edges:
             return
 
-        if QX11Info.isPlatformX11():
-            messageMap = {
-                Qt.TopEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_TOP,
-                Qt.TopEdge | Qt.LeftEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_TOPLEFT,
-                Qt.TopEdge | Qt.RightEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_TOPRIGHT,
-                Qt.BottomEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOM,
-                Qt.BottomEdge | Qt.LeftEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOMLEFT,
-                Qt.BottomEdge | Qt.RightEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_BOTTOMRIGHT,
-                Qt.LeftEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_LEFT,
-                Qt.RightEdge: WindowMessage._NET_WM_MOVERESIZE_SIZE_RIGHT,
-            }
-            cls.startSystemMoveResize(window, globalPos, messageMap[edges].value)
+        if XcbConnection.isAvailable():
+            cls.startSystemMoveResize(window, globalPos, EDGE_MESSAGES[int(edges)])
         else:
             window.windowHandle().startSystemResize(edges)
+
+
+class LinuxFrameExtents:
+    """ Tool class for handing the resize margin of window over to the window manager """
+
+    _isSupported = None
+
+    @classmethod
+    def isSupported(cls):
+        """ whether the window manager hit-tests the invisible margin declared by `_GTK_FRAME_EXTENTS` """
+        backend = XcbConnection.backend
+        if not backend.isAvailable() or not backend.isCompositingManagerRunning():
+            return False
+
+        if cls._isSupported is None:
+            xcbConn = XcbConnection.instance()
+            cls._isSupported = xcbConn.atoms["_GTK_FRAME_EXTENTS"] in xcbConn.supportedAtoms()
+
+        return cls._isSupported
+
+    @classmethod
+    def setFrameExtents(cls, window, margin):
+        """ declare the invisible margin of window and exclude it from the input region
+
+        Parameters
+        ----------
+        window: QWidget
+            window, whose visible area is inset by `margin` on each side
+
+        margin: int
+            width of the invisible margin in device independent pixels, `0` removes the margin
+
+        Returns
+        -------
+        request: XcbRequest
+            the request sent through `XcbWorker`
+        """
+        ratio = window.devicePixelRatioF()
+        margin = round(margin * ratio)
+        width = max(round(window.width() * ratio) - 2*margin, 0)
+        height = max(round(window.height() * ratio) - 2*margin, 0)
+        windowId = int(window.winId())
+
+        guiConn = XcbConnection.instance()
+
+        def func(xcbConn):
+            with XcbStats.operation("effect"):
+                # the window is created on the connection of Qt, a round trip on it makes sure
+                # the window exists on the X server before the worker connection uses it
+                guiConn.xproto.GetInputFocus().reply()
+                cls._setFrameExtents(xcbConn, windowId, margin, width, height)
+
+        return XcbWorker.instance().submit(func)
+
+    @staticmethod
+    def _setFrameExtents(xcbConn, windowId, margin, width, height):
+        xproto = xcbConn.xproto
+        shape = xcbConn.shape
+        extentsAtom = xcbConn.atoms["_GTK_FRAME_EXTENTS"]
+
+        if margin > 0:
+            # the order of extents is left, right, top, bottom
+            xproto.ChangeProperty(PropMode.Replace, windowId, extentsAtom, Atom.CARDINAL,
+                                  32, 4, struct.pack("=4I", *[margin]*4))
+
+            # mouse events in the margin go to the window manager
+            rect = RECTANGLE.synthetic(margin, margin, width, height)
+            shape.Rectangles(xcffib.shape.SO.Set, xcffib.shape.SK.Input,
+                             ClipOrdering.Unsorted, windowId, 0, 0, 1, [rect])
+        else:
+            xproto.DeleteProperty(windowId, extentsAtom)
+            shape.Mask(xcffib.shape.SO.Set, xcffib.shape.SK.Input, windowId, 0, 0, xcb.NONE)
@@ -0,0 +1,48 @@
+# coding:utf-8
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QFontInfo, QPalette
+from PyQt5.QtWidgets import QWidget
+
+
+class FramelessStyle:
+    """ Shared fonts and palettes, which style the frameless windows without style sheets """
+
+    _titleFont = None
+
+    @classmethod
+    def titleFont(cls):
+        """ get the title font shared by all the title bars, the font family is
+        resolved only once """
+        if cls._titleFont is None:
+            font = QFont("Segoe UI")
+            font.setPixelSize(13)
+            QFontInfo(font).family()
+            cls._titleFont = font
+
+        return cls._titleFont
+
+    @classmethod
+    def setTitleFont(cls, font: QFont):
+        """ set the title font used by the title bars created afterwards """
+        cls._titleFont = QFont(font)
+
+    @staticmethod
+    def setBackgroundColor(widget: QWidget, color):
+        """ set the background color of window through its palette
+
+        Parameters
+        ----------
+        widget: QWidget
+            window
+
+        color: QColor | Qt.GlobalColor
+            background color, `Qt.transparent` removes the background
+        """
+        palette = widget.palette()
+        palette.setColor(QPalette.Window, QColor(color))
+        widget.setPalette(palette)
+
+    @classmethod
+    def setTransparentBackground(cls, widget: QWidget):
+        """ remove the background of window """
+        cls.setBackgroundColor(widget, Qt.transparent)
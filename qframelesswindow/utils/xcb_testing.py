@@ -0,0 +1,178 @@
+# coding: utf-8
+import inspect
+import re
+import struct
+from collections import namedtuple
+from types import SimpleNamespace
+
+import xcffib as xcb
+from xcffib.xproto import xprotoExtension
+
+from .linux_utils import XcbBackend, XcbConnection
+
+
+XcbRecord = namedtuple("XcbRecord", ["connection", "kind", "extension", "name", "opcode", "data"])
+XcbRecord.__doc__ = """ Request, flush or blocking reply captured by `RecordingXcbBackend`, `kind` is
+`"request"`, `"flush"` or `"reply"` and `data` is the packed request without the header """
+
+
+class RecordingXcbBackend(XcbBackend):
+    """ Backend which records the X11 traffic instead of sending it, so that the requests
+    of an operation can be checked and counted without X server
+
+    Use it with `XcbConnection.setBackend()`.
+    """
+
+    def __init__(self, replies=None, root=1, isCompositingManagerRunning=True):
+        """
+        Parameters
+        ----------
+        replies: Dict[str, callable]
+            reply factories keyed by request name, e.g. `GetProperty`, each one is called
+            with the packed request and returns the reply. `InternAtom` is answered with
+            the atoms in `self.atoms` by default
+
+        root: int
+            root window of the fake screen
+
+        isCompositingManagerRunning: bool
+            whether to report a running compositing manager
+        """
+        self.records = []
+        self.atoms = {}
+        self.replies = {"InternAtom": self._internAtom}
+        self.replies.update(replies or {})
+        self.root = root
+        self._isCompositingManagerRunning = isCompositingManagerRunning
+
+    def isAvailable(self):
+        return True
+
+    def isCompositingManagerRunning(self):
+        return self._isCompositingManagerRunning
+
+    def connect(self):
+        return XcbConnection(RecordingXcbConnection(self, "gui"), 0, self.root)
+
+    def connectWorker(self, display=None):
+        return XcbConnection(RecordingXcbConnection(self, "worker"), 0, self.root)
+
+    def clear(self):
+        """ remove all the records """
+        self.records.clear()
+
+    def requests(self, connection=None, name=None):
+        """ get the `(extension, name, data)` of recorded requests, which can be
+        compared to check that the traffic is byte-identical
+
+        Parameters
+        ----------
+        connection: str
+            only get the requests of `"gui"` or `"worker"` connection, all by default
+
+        name: str
+            only get the requests with this name, e.g. `"SendEvent"`, all by default
+        """
+        return [(r.extension, r.name, r.data) for r in self.records
+                if r.kind == "request" and connection in (None, r.connection) and name in (None, r.name)]
+
+    def counts(self, connection=None):
+        """ get the number of requests, flushes and blocking replies
+
+        Parameters
+        ----------
+        connection: str
+            only count the records of `"gui"` or `"worker"` connection, all by default
+        """
+        counts = {"requests": 0, "flushes": 0, "replies": 0}
+        keys = {"request": "requests", "flush": "flushes", "reply": "replies"}
+        for record in self.records:
+            if connection in (None, record.connection):
+                counts[keys[record.kind]] += 1
+
+        return counts
+
+    def _internAtom(self, data):
+        length = struct.unpack_from("=H", data, 4)[0]
+        name = data[8:8+length].decode()
+        atom = self.atoms.setdefault(name, 1000 + len(self.atoms))
+        return SimpleNamespace(atom=atom)
+
+
+class RecordingXcbConnection:
+    """ Fake `xcffib.Connection` used by `RecordingXcbBackend` """
+
+    # request names of each extension class, keyed by opcode
+    _requestNames = {}
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+        self.core = self.wrapExtension(xprotoExtension(self))
+
+    def __call__(self, key):
+        extension = xcb.extensions[key][0](self, key)
+        return self.wrapExtension(extension)
+
+    @classmethod
+    def requestNames(cls, extensionClass):
+        """ get the request names of an `xcffib.Extension` subclass keyed by opcode,
+        which are read from the `send_request()` calls of its request methods """
+        names = cls._requestNames.get(extensionClass)
+        if names is not None:
+            return names
+
+        names = cls._requestNames[extensionClass] = {}
+        for name, method in inspect.getmembers(extensionClass, inspect.isfunction):
+            try:
+                match = re.search(r"self\.send_request\(\s*(\d+)", inspect.getsource(method))
+            except (OSError, TypeError):
+                continue
+
+            # the checked and unchecked variants call the request method instead of sending
+            if match:
+                names.setdefault(int(match.group(1)), name)
+
+        return names
+
+    def wrapExtension(self, extension):
+        """ make the extension record its requests instead of sending them """
+        extensionName = type(extension).__name__[:-len("Extension")]
+        names = self.requestNames(type(extension))
+
+        def sendRequest(opcode, data, cookie=None, reply=None, is_checked=False):
+            name = names.get(opcode, f"Request{opcode}")
+            data = data.getvalue()
+            self.backend.records.append(
+                XcbRecord(self.name, "request", extensionName, name, opcode, data))
+            return RecordingXcbCookie(self, extensionName, name, opcode, data)
+
+        extension.send_request = sendRequest
+        return extension
+
+    def flush(self):
+        self.backend.records.append(XcbRecord(self.name, "flush", None, None, None, None))
+
+    def disconnect(self):
+        pass
+
+
+class RecordingXcbCookie:
+    """ Cookie of a recorded request, whose reply is created by the reply factory of backend """
+
+    def __init__(self, conn, extension, name, opcode, data):
+        self.conn = conn
+        self.record = XcbRecord(conn.name, "reply", extension, name, opcode, data)
+
+    def reply(self):
+        backend = self.conn.backend
+        backend.records.append(self.record)
+
+        factory = backend.replies.get(self.record.name)
+        if factory is None:
+            raise LookupError(f"No reply is recorded for `{self.record.name}` request.")
+
+        return factory(self.record.data)
+
+    def check(self):
+        pass
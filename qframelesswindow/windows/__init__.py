@@ -10,14 +10,15 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QCloseEvent, QCursor
 from PyQt5.QtWidgets import QApplication, QWidget
 
-from ..titlebar import TitleBar
+from ..titlebar import TitleBar, TitleBarWindowMixin
 from ..utils import win32_utils as win_utils
+from ..utils.style_utils import FramelessStyle
 from ..utils.win32_utils import Taskbar
 from .c_structures import LPNCCALCSIZE_PARAMS
 from .window_effect import WindowsWindowEffect
 
 
-class WindowsFramelessWindow(QWidget):
+class WindowsFramelessWindow(TitleBarWindowMixin, QWidget):
     """  Frameless window for Windows system """
 
     BORDER_WIDTH = 5
@@ -33,6 +34,7 @@ class WindowsFramelessWindow(QWidget):
         # solve issue #5
         self.windowHandle().screenChanged.connect(self.__onScreenChanged)
 
+        self._updateContentsMargins()
         self.resize(500, 500)
         self.titleBar.raise_()
 
@@ -50,20 +52,6 @@ class WindowsFramelessWindow(QWidget):
         if not isinstance(self, AcrylicWindow):
             self.windowEffect.addShadowEffect(self.winId())
 
-    def setTitleBar(self, titleBar):
-        """ set custom title bar
-
-        Parameters
-        ----------
-        titleBar: TitleBar
-            title bar
-        """
-        self.titleBar.deleteLater()
-        self.titleBar.hide()
-        self.titleBar = titleBar
-        self.titleBar.setParent(self)
-        self.titleBar.raise_()
-
     def setResizeEnabled(self, isEnabled: bool):
         """ set whether resizing is enabled """
         self._isResizeEnabled = isEnabled
@@ -155,7 +143,7 @@ class AcrylicWindow(WindowsFramelessWindow):
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.__closedByKey = False
-        self.setStyleSheet("AcrylicWindow{background:transparent}")
+        FramelessStyle.setTransparentBackground(self)
 
     def updateFrameless(self):
         super().updateFrameless()
@@ -0,0 +1,114 @@
+# coding:utf-8
+""" Measure the CPU time of the hover fades of close buttons in many windows
+
+The close button of each window fades from normal to hover while the event loop runs
+for a while, once driven by the shared `ColorAnimationEngine` and once by one
+`QVariantAnimation` per button as a reference.
+
+Usage: python scripts/bench_button_fade.py
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer, QVariantAnimation
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from qframelesswindow.titlebar import CloseButton, TitleBarButtonState
+from qframelesswindow.titlebar.animation import ColorAnimationEngine
+
+WINDOWS = 200
+DURATION = 150
+LOOP_TIME = 300
+
+
+class CountingCloseButton(CloseButton):
+    """ Close button which counts its paints """
+
+    paintCount = 0
+
+    def paintEvent(self, e):
+        CountingCloseButton.paintCount += 1
+        super().paintEvent(e)
+
+
+def fadeByAnimation(button, targetState, duration):
+    """ fade the button with its own `QVariantAnimation` """
+    starts = button._getColors()
+    button.setState(targetState)
+    ends = button._getStateColors()
+
+    def onValueChanged(t):
+        button._animatedColors = tuple(
+            QColor(*(round(s + (e - s) * t) for s, e in zip(start.getRgb(), end.getRgb())))
+            for start, end in zip(starts, ends))
+        button.update()
+
+    def onFinished():
+        button._animatedColors = None
+        button.update()
+
+    animation = QVariantAnimation(button)
+    animation.setStartValue(0.0)
+    animation.setEndValue(1.0)
+    animation.setDuration(duration)
+    animation.valueChanged.connect(onValueChanged)
+    animation.finished.connect(onFinished)
+    animation.start(QVariantAnimation.DeleteWhenStopped)
+
+
+def runLoop(app, startFades):
+    """ start the fades, run the event loop and get the CPU time in ms and the paint count """
+    app.processEvents()
+    CountingCloseButton.paintCount = 0
+
+    loop = QEventLoop()
+    QTimer.singleShot(LOOP_TIME, loop.quit)
+
+    t = time.process_time()
+    startFades()
+    loop.exec_()
+    cpuTime = (time.process_time() - t) * 1000
+
+    return cpuTime, CountingCloseButton.paintCount
+
+
+def main():
+    app = QApplication(sys.argv)
+    windows = []
+    buttons = []
+    for _ in range(WINDOWS):
+        window = QWidget()
+        buttons.append(CountingCloseButton(window))
+        window.show()
+        windows.append(window)
+
+    engine = ColorAnimationEngine.instance()
+
+    def startEngineFades():
+        for button in buttons:
+            button.setAnimationDuration(DURATION)
+            button.setState(TitleBarButtonState.HOVER)
+
+    cpuTime, paints = runLoop(app, startEngineFades)
+    assert not engine.timer.isActive(), "The timer of engine is still running after the fades"
+    print(f"engine: {cpuTime:.0f} ms CPU, {engine.frameCount} frames, {paints} paints, "
+          "timer stopped afterwards")
+
+    def startAnimationFades():
+        for button in buttons:
+            button.setAnimationDuration(0)
+            button.setState(TitleBarButtonState.NORMAL)
+            fadeByAnimation(button, TitleBarButtonState.HOVER, DURATION)
+
+    cpuTime, paints = runLoop(app, startAnimationFades)
+    print(f"one QVariantAnimation per button: {cpuTime:.0f} ms CPU, {paints} paints")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# coding:utf-8
+""" Measure the paint time of the minimize, maximize and restore buttons at several
+device pixel ratios
+
+Each button is hovered, left and repainted, once with the shared `PixmapCache` and
+once with a cache too small to keep anything, which draws the glyph on every paint.
+Each device pixel ratio runs in its own process with `QT_SCALE_FACTOR`.
+
+Usage: python scripts/bench_button_paint.py
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SCALE_FACTORS = ("1", "1.25", "1.5", "2")
+REPAINTS = 1000
+
+
+def paintCost(button):
+    """ get the time of a paint in us """
+    from qframelesswindow.titlebar import TitleBarButtonState
+
+    t = perf_counter()
+    for _ in range(REPAINTS // 2):
+        for state in (TitleBarButtonState.HOVER, TitleBarButtonState.NORMAL):
+            button.setState(state)
+            button.repaint()
+
+    return (perf_counter() - t) / REPAINTS * 1e6
+
+
+def measure():
+    """ print the paint times of each button as JSON """
+    from PyQt5.QtWidgets import QApplication, QWidget
+
+    from qframelesswindow.titlebar import MaximizeButton, MinimizeButton, PixmapCache
+
+    app = QApplication(sys.argv)
+    window = QWidget()
+    restoreButton = MaximizeButton(window)
+    restoreButton.setMaxState(True)
+    buttons = {
+        "minimize": MinimizeButton(window),
+        "maximize": MaximizeButton(window),
+        "restore": restoreButton,
+    }
+    for i, button in enumerate(buttons.values()):
+        button.move(i * button.width(), 0)
+
+    window.show()
+    app.processEvents()
+
+    cache = PixmapCache.instance()
+    maxSize = cache.maxSize()
+    result = {}
+    for name, button in buttons.items():
+        cache.setMaxSize(0)
+        uncached = paintCost(button)
+        cache.setMaxSize(maxSize)
+        cached = paintCost(button)
+        result[name] = {"uncached": round(uncached, 1), "cached": round(cached, 1)}
+
+    result["ratio"] = window.devicePixelRatioF()
+    print(json.dumps(result))
+
+
+def main():
+    report = {}
+    for scaleFactor in SCALE_FACTORS:
+        env = dict(os.environ, QT_SCALE_FACTOR=scaleFactor)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        process = subprocess.run([sys.executable, __file__, "--measure"], env=env,
+                                 capture_output=True, text=True, check=True)
+        result = json.loads(process.stdout)
+        assert result.pop("ratio") == float(scaleFactor), f"QT_SCALE_FACTOR={scaleFactor} is ignored"
+        report[scaleFactor] = result
+
+    print("us/paint, uncached -> cached")
+    print(" " * 12 + "".join(f"{name:>20}" for name in report["1"]))
+    for scaleFactor, result in report.items():
+        row = "".join(f"{r['uncached']:>9} -> {r['cached']:<7}" for r in result.values())
+        print(f"ratio {scaleFactor:<6} {row}")
+
+
+if __name__ == '__main__':
+    if "--measure" in sys.argv:
+        measure()
+    else:
+        main()
@@ -0,0 +1,111 @@
+# coding:utf-8
+""" Check that the cost of a mouse move on one window stays flat as windows are opened
+
+Each window only filters the events of its own widget tree, so a move sent to one
+window runs one event filter whether 1 or 60 other windows are open. The time of a move is reported next to the time of a plain `QWidget`,
+which shows how much Qt itself slows down with the window count.
+
+Usage: python scripts/bench_event_filter_scaling.py
+"""
+import os
+import sys
+from pathlib import Path
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QPointF, Qt
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QApplication, QTextEdit, QVBoxLayout, QWidget
+
+from qframelesswindow import FramelessWindow
+
+WINDOW_COUNTS = (1, 10, 30, 60)
+EVENTS = 2000
+RUNS = 5
+
+
+class CountingWindow(FramelessWindow):
+    """ Frameless window which counts the mouse moves seen by the event filters """
+
+    filterCalls = 0
+
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.MouseMove:
+            CountingWindow.filterCalls += 1
+
+        return super().eventFilter(obj, e)
+
+
+def createWindow(cls=FramelessWindow):
+    window = cls()
+    layout = QVBoxLayout(window)
+    layout.addWidget(QTextEdit(window))
+    window.show()
+    return window
+
+
+def moveEvent(window):
+    """ create a hover move over the interior of window """
+    pos = QPointF(window.width() / 2, window.height() / 2)
+    return QMouseEvent(QEvent.MouseMove, pos, pos, pos + QPointF(window.pos()),
+                       Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+
+
+def eventCost(app, window):
+    """ get the best time of a hover move in us """
+    handle = window.windowHandle()
+    event = moveEvent(window)
+
+    best = float("inf")
+    for _ in range(RUNS):
+        t = perf_counter()
+        for _ in range(EVENTS):
+            app.sendEvent(handle, event)
+
+        best = min(best, perf_counter() - t)
+
+    return best / EVENTS * 1e6
+
+
+def filterCallsPerEvent(app, window):
+    """ get the number of event filter calls of a hover move, in all the windows """
+    handle = window.windowHandle()
+    event = moveEvent(window)
+
+    CountingWindow.filterCalls = 0
+    for _ in range(EVENTS):
+        app.sendEvent(handle, event)
+
+    return CountingWindow.filterCalls / EVENTS
+
+
+def main():
+    app = QApplication(sys.argv)
+
+    # the opened windows count the moves seen by their filters, and the moves are timed on
+    # a window without the counting override
+    plainWindow = createWindow(QWidget)
+    timedWindow = createWindow()
+    windows = []
+    filterCalls = {}
+    for count in WINDOW_COUNTS:
+        while len(windows) < count:
+            windows.append(createWindow(CountingWindow))
+
+        for _ in range(5):
+            app.processEvents()
+            sleep(0.01)
+
+        cost = eventCost(app, timedWindow)
+        filterCalls[count] = filterCallsPerEvent(app, windows[0])
+        plainCost = eventCost(app, plainWindow)
+        print(f"{count:3} windows: {cost:.1f} us/event, {filterCalls[count]:g} filter calls/event, "
+              f"plain QWidget: {plainCost:.1f} us/event")
+
+    assert set(filterCalls.values()) == {1}, f"A move isn't filtered once per event: {filterCalls}"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# coding:utf-8
+""" Measure the time and the allocations of the resize hover filter of Linux
+
+A hover move is passed to the event filter of window directly, once over the interior
+and once over the left border. `tracemalloc` checks that the memory kept by neither
+path grows with the number of moves.
+
+Usage: python scripts/bench_hover_filter.py
+"""
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QPointF, Qt
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QApplication
+
+from qframelesswindow.linux import LinuxFramelessWindow
+
+ITERATIONS = 20000
+RUNS = 5
+
+# the hover counter of window holds a new int after the moves
+MAX_RETAINED_BLOCKS = 1
+
+
+def moveEvent(window, x, y):
+    """ create a hover move at the window position `(x, y)` """
+    pos = QPointF(x, y)
+    return QMouseEvent(QEvent.MouseMove, pos, pos, pos + QPointF(window.pos()),
+                       Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+
+
+def filterCost(window, event):
+    """ get the best time of filtering the event in us """
+    handle = window.windowHandle()
+    eventFilter = window.eventFilter
+
+    best = float("inf")
+    for _ in range(RUNS):
+        t = perf_counter()
+        for _ in range(ITERATIONS):
+            eventFilter(handle, event)
+
+        best = min(best, perf_counter() - t)
+
+    return best / ITERATIONS * 1e6
+
+
+def retainedMemory(window, event):
+    """ get the blocks and bytes of the package still allocated after filtering the event """
+    handle = window.windowHandle()
+    eventFilter = window.eventFilter
+
+    # warm up the caches, e.g. the shared resize cursors
+    eventFilter(handle, event)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(ITERATIONS):
+        eventFilter(handle, event)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = [s for s in after.compare_to(before, "lineno") if "qframelesswindow" in s.traceback[0].filename]
+    return sum(s.count_diff for s in stats), sum(s.size_diff for s in stats)
+
+
+def main():
+    app = QApplication(sys.argv)
+    window = LinuxFramelessWindow()
+    window.resize(600, 400)
+    window.show()
+    for _ in range(5):
+        app.processEvents()
+        sleep(0.01)
+
+    events = {
+        "interior": moveEvent(window, 300, 200),
+        "border": moveEvent(window, 2, 200),
+    }
+    for name, event in events.items():
+        cost = filterCost(window, event)
+        blocks, size = retainedMemory(window, event)
+        print(f"{name}: {cost:.2f} us/move, {blocks} blocks ({size} bytes) retained after {ITERATIONS} moves")
+        assert blocks <= MAX_RETAINED_BLOCKS, f"The {name} path retains {blocks} blocks"
+
+    assert window.cursor().shape() == Qt.SizeHorCursor
+
+
+if __name__ == '__main__':
+    main()
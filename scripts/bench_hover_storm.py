@@ -0,0 +1,68 @@
+# coding:utf-8
+""" Measure the paint time of close buttons hovered in turn across many windows
+
+The close button of each window is hovered, left and repainted for several rounds,
+once with the shared `PixmapCache` and once with a cache too small to keep anything,
+which rasterizes the SVG icon on every paint.
+
+Usage: python scripts/bench_hover_storm.py
+"""
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from qframelesswindow.titlebar import CloseButton, PixmapCache, TitleBarButtonState
+
+WINDOWS = 100
+ROUNDS = 10
+
+
+def hoverStorm(buttons):
+    """ get the time of a paint in us """
+    paints = 0
+    t = perf_counter()
+    for _ in range(ROUNDS):
+        for button in buttons:
+            for state in (TitleBarButtonState.HOVER, TitleBarButtonState.NORMAL):
+                button.setState(state)
+                button.repaint()
+                paints += 1
+
+    return (perf_counter() - t) / paints * 1e6
+
+
+def main():
+    app = QApplication(sys.argv)
+    windows = []
+    buttons = []
+    for _ in range(WINDOWS):
+        window = QWidget()
+        buttons.append(CloseButton(window))
+        window.show()
+        windows.append(window)
+
+    app.processEvents()
+
+    cache = PixmapCache.instance()
+    maxSize = cache.maxSize()
+    cache.setMaxSize(0)
+    uncached = hoverStorm(buttons)
+
+    cache.setMaxSize(maxSize)
+    cache.hitCount = cache.missCount = 0
+    cached = hoverStorm(buttons)
+
+    paints = WINDOWS * ROUNDS * 2
+    print(f"{WINDOWS} windows, {paints} paints: {uncached:.1f} us/paint without cache, "
+          f"{cached:.1f} us/paint with cache ({cache.hitCount} hits, {cache.missCount} misses)")
+    assert cache.missCount <= 2, f"{cache.missCount} paints missed the cache"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+# coding:utf-8
+""" Measure the time from a mouse press to the window manager taking over a move or resize
+
+A stand-in window manager selects `SubstructureRedirect` on the root window of Xvfb,
+presses the mouse on the title bar and the edges of a `FramelessWindow` with XTest and
+timestamps the `_NET_WM_MOVERESIZE` client message sent by the window. The p50/p95/p99
+of each operation are printed as JSON, at device pixel ratio 1 and 1.5.
+
+Usage: python scripts/bench_move_resize_latency.py [samples per operation]
+"""
+import json
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+from math import ceil
+from pathlib import Path
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import xvfb
+
+DEFAULT_SAMPLES = 200
+SCALE_FACTORS = (1, 1.5)
+TIMEOUT = 2
+
+# XTest input types, the codes of the core events
+MOTION_NOTIFY = 6
+BUTTON_PRESS = 4
+BUTTON_RELEASE = 5
+
+# the `_NET_WM_MOVERESIZE` direction of each operation
+OPERATIONS = {
+    "topLeft": 0,
+    "top": 1,
+    "topRight": 2,
+    "right": 3,
+    "bottomRight": 4,
+    "bottom": 5,
+    "bottomLeft": 6,
+    "left": 7,
+    "move": 8,
+}
+
+
+def runWindow():
+    """ show a frameless window and print the native positions of the presses """
+    from PyQt5.QtCore import QPoint, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    from qframelesswindow import FramelessWindow
+
+    app = QApplication(sys.argv)
+
+    # the presses are repeated at the same position, which mustn't be a double click
+    app.setDoubleClickInterval(0)
+
+    window = FramelessWindow()
+    window.setGeometry(100, 100, 600, 400)
+    window.show()
+
+    def report():
+        if not window.windowHandle().isExposed():
+            return QTimer.singleShot(10, report)
+
+        w, h = window.width(), window.height()
+        x, y = window.BORDER_WIDTH // 2, window.BORDER_WIDTH // 2
+        r, b = w - 1 - x, h - 1 - y
+        points = {
+            "topLeft": (x, y),
+            "top": (w // 2, y),
+            "topRight": (r, y),
+            "right": (r, h // 2),
+            "bottomRight": (r, b),
+            "bottom": (w // 2, b),
+            "bottomLeft": (x, b),
+            "left": (x, h // 2),
+            "move": (w // 3, window.titleBar.y() + window.titleBar.height() // 2),
+        }
+
+        ratio = window.devicePixelRatioF()
+        for name, (px, py) in points.items():
+            pos = window.mapToGlobal(QPoint(px, py))
+            points[name] = (round(pos.x() * ratio), round(pos.y() * ratio))
+
+        print(json.dumps({"windowId": int(window.winId()), "points": points}), flush=True)
+
+    QTimer.singleShot(0, report)
+    app.exec_()
+
+
+class StandInWindowManager:
+    """ Window manager which maps and configures windows as requested and timestamps
+    the `_NET_WM_MOVERESIZE` messages """
+
+    def __init__(self, display):
+        import xcffib as xcb
+        import xcffib.xtest
+        from xcffib.xproto import CW, EventMask
+
+        self.conn = xcb.connect(display=display)
+        self.xtest = self.conn(xcffib.xtest.key)
+        self.root = self.conn.get_setup().roots[self.conn.pref_screen].root
+        self.moveResizeAtom = self.conn.core.InternAtom(
+            False, len("_NET_WM_MOVERESIZE"), "_NET_WM_MOVERESIZE").reply().atom
+
+        # only one client can select the redirect, so it fails if another manager runs
+        self.conn.core.ChangeWindowAttributesChecked(
+            self.root, CW.EventMask,
+            [EventMask.SubstructureRedirect | EventMask.SubstructureNotify]).check()
+
+        self.messages = []
+
+    def _handle(self, event):
+        """ handle an event, the move or resize messages are saved with the receiving time """
+        from xcffib.xproto import ClientMessageEvent, ConfigureRequestEvent, MapRequestEvent
+
+        if isinstance(event, MapRequestEvent):
+            self.conn.core.MapWindow(event.window)
+        elif isinstance(event, ConfigureRequestEvent):
+            values = [event.x, event.y, event.width, event.height,
+                      event.border_width, event.sibling, event.stack_mode]
+            values = [v for i, v in enumerate(values) if event.value_mask & (1 << i)]
+            self.conn.core.ConfigureWindow(event.window, event.value_mask, values)
+        elif isinstance(event, ClientMessageEvent) and event.type == self.moveResizeAtom:
+            self.messages.append((perf_counter(), event.data.data32[2]))
+
+        self.conn.flush()
+
+    def processEvents(self, timeout=0):
+        """ handle the events which arrive within `timeout` seconds """
+        deadline = perf_counter() + timeout
+        while True:
+            event = self.conn.poll_for_event()
+            if event is not None:
+                self._handle(event)
+                continue
+
+            remaining = deadline - perf_counter()
+            if remaining <= 0:
+                return
+
+            select.select([self.conn.get_file_descriptor()], [], [], remaining)
+
+    def waitForMessage(self, direction, timeout=TIMEOUT):
+        """ get the receiving time of the message with `direction`, `None` on timeout """
+        deadline = perf_counter() + timeout
+        while perf_counter() < deadline:
+            for i, (time, d) in enumerate(self.messages):
+                if d == direction:
+                    del self.messages[:i + 1]
+                    return time
+
+            self.processEvents(min(0.01, deadline - perf_counter()))
+
+        return None
+
+    def _fakeInput(self, type, detail, x=0, y=0):
+        self.xtest.FakeInput(type, detail, 0, self.root, x, y, 0)
+
+    def press(self, x, y):
+        """ move the pointer to the native position and press the left button,
+        return the time when the press is sent """
+        self._fakeInput(MOTION_NOTIFY, 0, x, y)
+        self.conn.flush()
+        self.processEvents(0.005)
+
+        self.messages.clear()
+        time = perf_counter()
+        self._fakeInput(BUTTON_PRESS, 1)
+        self.conn.flush()
+        return time
+
+    def release(self):
+        self._fakeInput(BUTTON_RELEASE, 1)
+        self.conn.flush()
+
+        # let the window handle the release before the next press
+        self.processEvents(0.02)
+        self.messages.clear()
+
+    def disconnect(self):
+        self.conn.disconnect()
+
+
+def percentiles(samples):
+    """ get the p50/p95/p99/max in ms of the samples in seconds """
+    samples = sorted(samples)
+    n = len(samples)
+    if not n:
+        return {"count": 0}
+
+    percentile = lambda p: round(samples[max(ceil(n * p / 100) - 1, 0)] * 1000, 3)
+    return {
+        "count": n,
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": round(samples[-1] * 1000, 3),
+    }
+
+
+def measure(display, scaleFactor, samples):
+    """ measure the press to takeover latency of each operation on `display` """
+    wm = StandInWindowManager(display)
+    env = dict(os.environ, DISPLAY=display, QT_QPA_PLATFORM="xcb",
+               QT_SCALE_FACTOR=str(scaleFactor))
+    process = subprocess.Popen([sys.executable, __file__, "--window"], env=env,
+                               stdout=subprocess.PIPE, text=True)
+
+    # the window reports its positions once the stand-in manager has mapped it
+    lines = queue.Queue()
+    threading.Thread(target=lambda: lines.put(process.stdout.readline()), daemon=True).start()
+
+    try:
+        deadline = perf_counter() + 10
+        while lines.empty():
+            if process.poll() is not None or perf_counter() > deadline:
+                raise RuntimeError("The window failed to show")
+
+            wm.processEvents(0.01)
+
+        points = json.loads(lines.get())["points"]
+        wm.processEvents(0.2)
+
+        result = {}
+        for name, direction in OPERATIONS.items():
+            latencies = []
+            missed = 0
+            for _ in range(samples):
+                pressTime = wm.press(*points[name])
+                messageTime = wm.waitForMessage(direction)
+                wm.release()
+
+                if messageTime is None:
+                    missed += 1
+                else:
+                    latencies.append(messageTime - pressTime)
+
+            result[name] = percentiles(latencies)
+            result[name]["missed"] = missed
+
+        return result
+    finally:
+        process.terminate()
+        process.wait()
+        wm.disconnect()
+
+
+def main():
+    if not xvfb.isAvailable():
+        xvfb.skip("move and resize latency")
+
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+
+    report = {}
+    for scaleFactor in SCALE_FACTORS:
+        with xvfb.xvfb() as display:
+            report[f"{scaleFactor:g}"] = measure(display, scaleFactor, samples)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    if "--window" in sys.argv:
+        runWindow()
+    else:
+        main()
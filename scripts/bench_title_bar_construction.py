@@ -0,0 +1,68 @@
+# coding:utf-8
+""" Measure the construction of standard title bars with the shared font and with the
+style sheet which the title label used to have
+
+Usage: python scripts/bench_title_bar_construction.py
+"""
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import sip
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from qframelesswindow import StandardTitleBar
+
+TITLE_BARS = 200
+RUNS = 5
+
+# the style sheet set on the title label before the shared font
+LABEL_STYLE_SHEET = """
+    QLabel{
+        background: transparent;
+        font: 13px 'Segoe UI';
+        padding: 0 4px
+    }
+"""
+
+
+def construct(styleSheet):
+    """ get the best time of constructing and polishing the title bars in ms """
+    best = float("inf")
+    for _ in range(RUNS):
+        windows = []
+        t = perf_counter()
+        for _ in range(TITLE_BARS):
+            window = QWidget()
+            titleBar = StandardTitleBar(window)
+            if styleSheet:
+                titleBar.titleLabel.setStyleSheet(styleSheet)
+
+            titleBar.setTitle("PyQt-Frameless-Window")
+            for widget in [titleBar] + titleBar.findChildren(QWidget):
+                widget.ensurePolished()
+
+            windows.append(window)
+
+        best = min(best, perf_counter() - t)
+
+        for window in windows:
+            sip.delete(window)
+
+    return best * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    styleSheetTime = construct(LABEL_STYLE_SHEET)
+    fontTime = construct(None)
+    print(f"{TITLE_BARS} title bars: {styleSheetTime:.0f} ms with the label style sheet, "
+          f"{fontTime:.0f} ms with the shared font")
+
+
+if __name__ == '__main__':
+    main()
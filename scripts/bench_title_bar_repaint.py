@@ -0,0 +1,94 @@
+# coding:utf-8
+""" Count the paints of the title bar while the content under it is animating
+
+A widget below the title bar is repainted for a number of frames. A transparent title
+bar and its buttons are repainted with it, an opaque one isn't repainted at all.
+
+Usage: python scripts/bench_title_bar_repaint.py
+"""
+import os
+import sys
+from pathlib import Path
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QObject
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from qframelesswindow import FramelessWindow, PaintedTitleBar, StandardTitleBar, TitleBar
+
+FRAMES = 300
+
+
+class AnimatedWidget(QWidget):
+    """ Widget whose color changes on every paint """
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.frame = 0
+
+    def paintEvent(self, e):
+        self.frame += 1
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor.fromHsv(self.frame % 360, 128, 224))
+
+
+class PaintCounter(QObject):
+    """ Count the paint events of a widget and its descendants """
+
+    def __init__(self, widget):
+        super().__init__()
+        self.count = 0
+        for w in [widget] + widget.findChildren(QWidget):
+            w.installEventFilter(self)
+
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.Paint:
+            self.count += 1
+
+        return False
+
+
+def measure(app, titleBarClass, isOpaque):
+    """ get the title bar paints and the time of a frame in ms """
+    window = FramelessWindow()
+    window.setTitleBar(titleBarClass(window))
+    window.titleBar.setOpaquePaintEnabled(isOpaque)
+    window.resize(600, 400)
+
+    content = AnimatedWidget(window)
+    content.setGeometry(0, 0, 600, 100)
+    content.lower()
+
+    window.show()
+    for _ in range(5):
+        app.processEvents()
+        sleep(0.01)
+
+    counter = PaintCounter(window.titleBar)
+    t = perf_counter()
+    for _ in range(FRAMES):
+        content.repaint()
+
+    frameTime = (perf_counter() - t) / FRAMES * 1000
+    window.close()
+    window.deleteLater()
+    return counter.count, frameTime
+
+
+def main():
+    app = QApplication(sys.argv)
+    print(f"title bar and child paints in {FRAMES} frames, transparent -> opaque")
+    for titleBarClass in (TitleBar, StandardTitleBar, PaintedTitleBar):
+        paints, frameTime = measure(app, titleBarClass, False)
+        opaquePaints, opaqueFrameTime = measure(app, titleBarClass, True)
+        print(f"{titleBarClass.__name__:<18} {paints:>5} -> {opaquePaints:<5} "
+              f"({frameTime:.2f} -> {opaqueFrameTime:.2f} ms/frame)")
+        assert opaquePaints == 0, f"The opaque {titleBarClass.__name__} is repainted with the content"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# coding:utf-8
+""" Check the `_GTK_FRAME_EXTENTS` property and the input shape set by `LinuxFrameExtents`
+
+The request bytes are checked with `RecordingXcbBackend`. When Xvfb is installed, the
+property and the input shape are also read back from a real X server.
+
+Usage: python scripts/check_frame_extents.py
+"""
+import os
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import xvfb
+
+MARGIN = 8
+WIDTH = 400
+HEIGHT = 300
+
+
+def expectedRequests(windowId, atom, margin, width, height):
+    """ get the `(name, data)` of the requests which set the margin, packed by hand """
+    if margin > 0:
+        return [
+            ("ChangeProperty", struct.pack("=xB2xIIIB3xI", 0, windowId, atom, 6, 32, 4) +
+             struct.pack("=4I", *[margin]*4)),
+            ("Rectangles", struct.pack("=xx2xBBBxIhh", 0, 2, 0, windowId, 0, 0) +
+             struct.pack("=hhHH", margin, margin, width - 2*margin, height - 2*margin)),
+        ]
+
+    return [
+        ("DeleteProperty", struct.pack("=xx2xII", windowId, atom)),
+        ("Mask", struct.pack("=xx2xBB2xIhhI", 0, 2, windowId, 0, 0, 0)),
+    ]
+
+
+def checkRequests():
+    """ check the request bytes and the support query without X server """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt5.QtWidgets import QApplication, QWidget
+
+    from qframelesswindow.utils.linux_utils import LinuxFrameExtents, XcbConnection, XcbWorker
+    from qframelesswindow.utils.xcb_testing import RecordingXcbBackend
+
+    app = QApplication(sys.argv)
+    supported = []
+    backend = RecordingXcbBackend(replies={
+        "GetInputFocus": lambda data: None,
+        "GetProperty": lambda data: SimpleNamespace(value=SimpleNamespace(to_atoms=lambda: supported)),
+    })
+    XcbConnection.setBackend(backend)
+
+    xcbConn = XcbConnection.instance()
+    atom = xcbConn.atoms["_GTK_FRAME_EXTENTS"]
+    supported.append(atom)
+
+    # the support query is sent with the atom batch, so the check sends no request
+    requests = backend.requests("gui")
+    assert requests[-1][1] == "GetProperty", requests[-1]
+    assert LinuxFrameExtents.isSupported()
+    assert backend.requests("gui") == requests
+
+    window = QWidget()
+    window.resize(WIDTH, HEIGHT)
+    windowId = int(window.winId())
+    ratio = window.devicePixelRatioF()
+    width, height = round(WIDTH * ratio), round(HEIGHT * ratio)
+
+    for margin in (MARGIN, 0):
+        backend.clear()
+        LinuxFrameExtents.setFrameExtents(window, margin).result(5)
+        # the connection of worker interns its atoms and asks for the supported ones first
+        actual = [r[1:] for r in backend.requests("worker")
+                  if r[1] not in ("InternAtom", "GetProperty")]
+        expected = expectedRequests(windowId, atom, round(margin * ratio), width, height)
+        assert actual == expected, f"margin {margin}: {actual} != {expected}"
+
+    XcbWorker.instance().stop()
+    print(f"frame extents requests match at device pixel ratio {ratio:g}")
+
+
+def checkDisplay():
+    """ set the margin of a window on the X server of `$DISPLAY` and read it back """
+    import xcffib as xcb
+    import xcffib.shape
+    from PyQt5.QtWidgets import QApplication, QWidget
+    from xcffib.xproto import Atom, PropMode
+
+    from qframelesswindow.utils.linux_utils import LinuxFrameExtents, XcbConnection, XcbWorker
+
+    conn = xcb.connect()
+    shape = conn(xcffib.shape.key)
+    root = conn.get_setup().roots[conn.pref_screen].root
+    intern = lambda name: conn.core.InternAtom(False, len(name), name).reply().atom
+    supportedAtom, extentsAtom = intern("_NET_SUPPORTED"), intern("_GTK_FRAME_EXTENTS")
+
+    # play the window manager which supports the frame extents
+    conn.core.ChangeProperty(PropMode.Replace, root, supportedAtom, Atom.ATOM, 32, 1,
+                             struct.pack("=I", extentsAtom))
+    conn.flush()
+
+    app = QApplication(sys.argv)
+    window = QWidget()
+    window.resize(WIDTH, HEIGHT)
+    window.show()
+    for _ in range(20):
+        app.processEvents()
+        time.sleep(0.01)
+
+    assert extentsAtom in XcbConnection.instance().supportedAtoms()
+
+    windowId = int(window.winId())
+    LinuxFrameExtents.setFrameExtents(window, MARGIN).result(5)
+    reply = conn.core.GetProperty(False, windowId, extentsAtom, Atom.CARDINAL, 0, 4).reply()
+    assert reply.value.to_atoms() == (MARGIN,)*4, reply.value.to_atoms()
+
+    rects = [(r.x, r.y, r.width, r.height) for r in
+             shape.GetRectangles(windowId, xcffib.shape.SK.Input).reply().rectangles]
+    assert rects == [(MARGIN, MARGIN, WIDTH - 2*MARGIN, HEIGHT - 2*MARGIN)], rects
+
+    LinuxFrameExtents.setFrameExtents(window, 0).result(5)
+    reply = conn.core.GetProperty(False, windowId, extentsAtom, Atom.CARDINAL, 0, 4).reply()
+    assert reply.value_len == 0, reply.value.to_atoms()
+
+    rects = [(r.x, r.y, r.width, r.height) for r in
+             shape.GetRectangles(windowId, xcffib.shape.SK.Input).reply().rectangles]
+    assert rects == [(0, 0, WIDTH, HEIGHT)], rects
+
+    XcbWorker.instance().stop()
+    print("frame extents and input shape read back from the X server")
+
+
+def main():
+    # the platform of Qt can't be changed in a process, so each check runs in its own
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    process = subprocess.run([sys.executable, __file__, "--requests"], env=env)
+    if process.returncode != 0:
+        sys.exit(process.returncode)
+
+    if not xvfb.isAvailable():
+        xvfb.skip("reading back from Xvfb")
+
+    with xvfb.xvfb() as display:
+        print(xvfb.runOnDisplay(__file__, display, "--display"), end="")
+
+
+if __name__ == '__main__':
+    if "--requests" in sys.argv:
+        checkRequests()
+    elif "--display" in sys.argv:
+        checkDisplay()
+    else:
+        main()
@@ -0,0 +1,64 @@
+# coding:utf-8
+""" Check that importing qframelesswindow stays cheap
+
+Usage: python scripts/check_import_time.py [budget in ms]
+"""
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Qt is imported by the application anyway, so it is loaded before the package is timed
+PRELOAD = "import PyQt5.QtCore, PyQt5.QtGui, PyQt5.QtWidgets"
+
+# modules which are only imported on first use
+LAZY_MODULES = ("xcffib", "PyQt5.QtSvg", "PyQt5.QtXml", "PyQt5.QtX11Extras", "qframelesswindow._rc.resource")
+
+DEFAULT_BUDGET = 50
+RUNS = 5
+
+
+def importTime():
+    """ import the package in a new interpreter
+
+    Returns
+    -------
+    times: Dict[str, int]
+        cumulative import time of each module in microseconds
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PRELOAD + "; import qframelesswindow"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in process.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            times[match.group(2)] = int(match.group(1))
+
+    return times
+
+
+def isLazyModule(name):
+    return any(name == module or name.startswith(module + ".") for module in LAZY_MODULES)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET
+    runs = [importTime() for _ in range(RUNS)]
+
+    modules = sorted(m for m in runs[0] if isLazyModule(m))
+    assert not modules, f"Modules imported before first use: {', '.join(modules)}"
+
+    # the best run is the least disturbed by the other processes
+    total = min(times["qframelesswindow"] for times in runs) / 1000
+    assert total < budget, f"Importing qframelesswindow takes {total:.1f} ms, the budget is {budget:g} ms"
+
+    print(f"Importing qframelesswindow takes {total:.1f} ms, the budget is {budget:g} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# coding:utf-8
+""" Check that starting a move or resize on X11 sends the same bytes as the original
+implementation, which flushed twice and packed every event from scratch
+
+The traffic is captured by `RecordingXcbBackend`, so no X server is needed.
+
+Usage: [QT_SCALE_FACTOR=1.5] python scripts/check_move_resize_bytes.py
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import xcffib as xcb
+from PyQt5.QtCore import QPoint, QPointF, Qt
+from PyQt5.QtWidgets import QApplication, QWidget
+from xcffib.xproto import (ButtonIndex, ButtonMask, ButtonReleaseEvent,
+                           ClientMessageData, ClientMessageEvent, EventMask)
+
+from qframelesswindow.utils.linux_utils import (EDGE_MESSAGES, LinuxMoveResize, WindowMessage,
+                                                XcbConnection)
+from qframelesswindow.utils.xcb_testing import RecordingXcbBackend
+
+
+EDGES = {
+    "move": None,
+    "top": Qt.TopEdge,
+    "topLeft": Qt.TopEdge | Qt.LeftEdge,
+    "topRight": Qt.TopEdge | Qt.RightEdge,
+    "bottom": Qt.BottomEdge,
+    "bottomLeft": Qt.BottomEdge | Qt.LeftEdge,
+    "bottomRight": Qt.BottomEdge | Qt.RightEdge,
+    "left": Qt.LeftEdge,
+    "right": Qt.RightEdge,
+}
+
+
+def referenceMoveResize(xcbConn, window, globalPos, message):
+    """ the original `LinuxMoveResize.startSystemMoveResize()`, sending through `xcbConn` """
+    xproto = xcbConn.xproto
+    windowId = int(window.winId())
+
+    # sendButtonReleaseEvent()
+    nativePos = QPointF(QPointF(globalPos) * window.devicePixelRatio()).toPoint()
+    pos = window.mapFromGlobal(nativePos)
+    event = ButtonReleaseEvent.synthetic(
+        detail=ButtonIndex._1,
+        time=xcb.CurrentTime,
+        root=xcbConn.root,
+        event=windowId,
+        child=xcb.NONE,
+        root_x=nativePos.x(),
+        root_y=nativePos.y(),
+        event_x=pos.x(),
+        event_y=pos.y(),
+        state=ButtonMask._1,
+        same_screen=True,
+    )
+    xproto.SendEvent(True, windowId, EventMask.ButtonRelease, event.pack())
+    xcbConn.conn.flush()
+
+    nativePos = QPointF(QPointF(globalPos) * window.devicePixelRatio()).toPoint()
+    union = ClientMessageData.synthetic([
+        nativePos.x(),
+        nativePos.y(),
+        message,
+        ButtonIndex._1,
+        0
+    ], "I"*5)
+    event = ClientMessageEvent.synthetic(
+        format=32,
+        window=windowId,
+        type=xcbConn.atoms["_NET_WM_MOVERESIZE"],
+        data=union
+    )
+    xproto.UngrabPointer(xcb.CurrentTime)
+    xproto.SendEvent(
+        False,
+        xcbConn.root,
+        EventMask.SubstructureRedirect | EventMask.SubstructureNotify,
+        event.pack()
+    )
+    xcbConn.conn.flush()
+
+
+def traffic(backend, operation):
+    """ get the requests and flush count of `operation` """
+    backend.clear()
+    operation()
+    requests = backend.requests("gui")
+    return [r for r in requests if r[1] in ("SendEvent", "UngrabPointer")], backend.counts("gui")["flushes"]
+
+
+def main():
+    app = QApplication(sys.argv)
+    backend = RecordingXcbBackend(root=0x2a1)
+    XcbConnection.setBackend(backend)
+    xcbConn = XcbConnection.instance()
+
+    window = QWidget()
+    window.setGeometry(120, 80, 400, 300)
+
+    # resolve the atom before the traffic is compared
+    xcbConn.atoms["_NET_WM_MOVERESIZE"]
+
+    checks = 0
+    for name, edges in EDGES.items():
+        if edges is None:
+            message = WindowMessage._NET_WM_MOVERESIZE_MOVE.value
+            operation = lambda: LinuxMoveResize.startSystemMove(window, pos)
+        else:
+            message = EDGE_MESSAGES[int(edges)]
+            operation = lambda: LinuxMoveResize.starSystemResize(window, pos, edges)
+
+        # the original implementation packed the position unsigned and failed on negative ones
+        for pos in (QPoint(0, 0), QPoint(121, 81), QPoint(519, 379), QPoint(30, 2000)):
+            expected, _ = traffic(backend, lambda: referenceMoveResize(xcbConn, window, pos, message))
+            actual, flushes = traffic(backend, operation)
+
+            assert [r[1] for r in actual] == ["SendEvent", "UngrabPointer", "SendEvent"], \
+                f"{name} at {pos}: unexpected requests {[r[1] for r in actual]}"
+            assert actual == expected, f"{name} at {pos}: the packed requests differ"
+            assert flushes == 1, f"{name} at {pos}: {flushes} flushes instead of 1"
+            checks += 1
+
+    print(f"{checks} moves and resizes at device pixel ratio {window.devicePixelRatioF():g} "
+          "match the original bytes with one flush each")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# coding:utf-8
+""" Check `XcbWorker` headlessly: the property round trip, the delivery of `finished`
+and `failed` on the GUI thread and the results of dropped requests
+
+The traffic is captured by `RecordingXcbBackend`, so no X server is needed.
+
+Usage: python scripts/check_xcb_worker.py
+"""
+import gc
+import os
+import struct
+import sys
+from pathlib import Path
+from time import perf_counter, sleep
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QThread
+from PyQt5.QtWidgets import QApplication
+from xcffib.xproto import Atom
+
+from qframelesswindow.utils.linux_utils import XcbConnection, XcbWorker
+from qframelesswindow.utils.xcb_testing import RecordingXcbBackend
+
+
+class PropertyServer:
+    """ Answer `GetProperty` with the data of the last recorded `ChangeProperty` """
+
+    def __init__(self):
+        self.backend = RecordingXcbBackend(replies={"GetProperty": self.getProperty})
+
+    def getProperty(self, data):
+        _, window, property, _, _, _ = struct.unpack_from("=xB2xIIIII", data)
+        for record in reversed(self.backend.records):
+            if record.kind != "request" or record.name not in ("ChangeProperty", "DeleteProperty"):
+                continue
+
+            if record.name == "DeleteProperty":
+                if struct.unpack_from("=4xII", record.data) == (window, property):
+                    break
+
+                continue
+
+            _, w, p, type, format, length = struct.unpack_from("=xB2xIIIB3xI", record.data)
+            if (w, p) == (window, property):
+                value = record.data[24:24 + length * format // 8]
+                return SimpleNamespace(type=type, format=format, value=value)
+
+        return SimpleNamespace(type=Atom._None, format=0, value=b"")
+
+
+def waitUntil(app, condition, timeout=5):
+    """ process events until `condition()` is true """
+    deadline = perf_counter() + timeout
+    while not condition():
+        assert perf_counter() < deadline, "Timed out waiting for the worker"
+        app.processEvents()
+        sleep(0.001)
+
+
+def main():
+    app = QApplication(sys.argv)
+    server = PropertyServer()
+    XcbConnection.setBackend(server.backend)
+    worker = XcbWorker.instance()
+
+    results = []
+    threads = []
+
+    def onFinished(result):
+        threads.append(QThread.currentThread() is app.thread())
+        results.append(("finished", result))
+
+    def onFailed(error):
+        threads.append(QThread.currentThread() is app.thread())
+        results.append(("failed", type(error).__name__))
+
+    def connect(request):
+        request.finished.connect(onFinished)
+        request.failed.connect(onFailed)
+        return request
+
+    # property round trip through the worker connection
+    data = struct.pack("=3I", 1, 2, 3)
+    connect(worker.changeProperty(0x400001, "_QFW_CHECK", Atom.CARDINAL, 32, data))
+    connect(worker.getProperty(0x400001, "_QFW_CHECK"))
+    waitUntil(app, lambda: len(results) == 2)
+    assert results[0] == ("finished", None), results[0]
+    reply = results[1][1]
+    assert (reply.type, reply.format, reply.value) == (Atom.CARDINAL, 32, data), reply
+
+    connect(worker.deleteProperty(0x400001, "_QFW_CHECK"))
+    request = connect(worker.getProperty(0x400001, "_QFW_CHECK"))
+    assert request.result(5).value == b""
+
+    # an exception of request is reported by `failed`
+    def fail(xcbConn):
+        raise ValueError("expected failure")
+
+    connect(worker.submit(fail))
+    waitUntil(app, lambda: len(results) == 5)
+    assert results[-1] == ("failed", "ValueError"), results[-1]
+
+    # requests dropped by the caller still report their results
+    results.clear()
+    for i in range(3):
+        connect(worker.submit(lambda xcbConn, i=i: i))
+
+    gc.collect()
+    waitUntil(app, lambda: len(results) == 3)
+    assert sorted(results) == [("finished", 0), ("finished", 1), ("finished", 2)], results
+    assert all(threads), "A signal was emitted outside the GUI thread"
+
+    worker.stop()
+    print(f"{len(threads)} requests reported on the GUI thread, "
+          f"worker traffic: {server.backend.counts('worker')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# coding:utf-8
+""" Report the X11 requests, flushes and blocking replies of each public operation
+
+The traffic is captured by `RecordingXcbBackend`, so no X server is needed.
+
+Usage: python scripts/xcb_traffic.py
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QPoint, Qt
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from qframelesswindow.utils.linux_utils import (LinuxFrameExtents, LinuxMoveResize,
+                                                XcbConnection, XcbRequest)
+from qframelesswindow.utils.xcb_testing import RecordingXcbBackend
+
+
+def measure(backend, operation):
+    """ get the traffic of `operation` on each connection """
+    backend.clear()
+    request = operation()
+
+    # wait for the requests sent by the worker thread
+    if isinstance(request, XcbRequest):
+        request.result(5)
+
+    return {connection: backend.counts(connection) for connection in ("gui", "worker")}
+
+
+def main():
+    app = QApplication(sys.argv)
+    backend = RecordingXcbBackend(replies={"GetInputFocus": lambda data: None})
+    XcbConnection.setBackend(backend)
+
+    window = QWidget()
+    window.resize(400, 300)
+    pos = QPoint(100, 10)
+
+    report = {
+        "connect": measure(backend, XcbConnection.instance),
+        "firstMove": measure(backend, lambda: LinuxMoveResize.startSystemMove(window, pos)),
+        "move": measure(backend, lambda: LinuxMoveResize.startSystemMove(window, pos)),
+        "resize": measure(backend, lambda: LinuxMoveResize.starSystemResize(window, pos, Qt.LeftEdge)),
+        "setFrameExtents": measure(backend, lambda: LinuxFrameExtents.setFrameExtents(window, 8)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# coding:utf-8
+""" Start a virtual X server for the scripts which need a real display """
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+
+def isAvailable():
+    """ whether Xvfb is installed """
+    return shutil.which("Xvfb") is not None
+
+
+def skip(name):
+    """ report that a script is skipped because Xvfb is missing """
+    print(f"{name}: skipped, Xvfb is not installed")
+    sys.exit(0)
+
+
+@contextmanager
+def xvfb(size="1280x800", depth=24, timeout=10):
+    """ run Xvfb on a free display while the context is active
+
+    Parameters
+    ----------
+    size: str
+        screen size in pixels
+
+    depth: int
+        color depth of screen
+
+    timeout: float
+        seconds to wait for the server
+
+    Yields
+    ------
+    display: str
+        the display, e.g. `":99"`
+    """
+    number = 99
+    while os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+
+    display = f":{number}"
+    process = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", f"{size}x{depth}", "-nolisten", "tcp",
+         "+extension", "XTEST", "+extension", "SHAPE"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Xvfb failed to start on {display}")
+
+            time.sleep(0.05)
+
+        yield display
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def runOnDisplay(script, display, *args, env=None):
+    """ run a script with the Qt xcb platform on `display` and return its stdout """
+    env = dict(os.environ if env is None else env, DISPLAY=display, QT_QPA_PLATFORM="xcb")
+    process = subprocess.run([sys.executable, script, *args], env=env,
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"{os.path.basename(script)} failed:\n{process.stderr}")
+
+    return process.stdout